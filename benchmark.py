@@ -0,0 +1,275 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+from charting_better import (build_chord_better, build_chord_backtracking, get_chord_fret_candidates, SearchStats,
+                             iter_instrument_chord_voicings)
+from charting_vectorized import build_chord_vectorized
+from chord_dicts import chords_to_intervals, index_to_note
+from style_dicts import instrument_presets
+from voicing_scoring import select_top_voicings
+
+
+# engines with the build_chord_better signature, by name
+chord_engines = {'better': build_chord_better,
+                 'backtracking': build_chord_backtracking,
+                 'vectorized': build_chord_vectorized,
+                 }
+# whole-instrument searches through iter_instrument_chord_voicings, as the app and the batch runner search, by name.
+# Options: "executor" searches on a process pool of os.cpu_count() workers, "top_k" keeps only the top_k most playable
+# voicings of each chord
+instrument_searches = {'instrument': dict(),
+                       'instrument-executor': {'executor': True},
+                       'instrument-top-k': {'top_k': 10},
+                       }
+# (num_frets, tuning) of instruments beyond the presets, with strings tuned in fourths up from B
+synthetic_instruments = {
+    f'Synthetic {num_strings}-string': (
+        36, '-'.join(index_to_note.get((11 + 5 * string) % 12) for string in range(num_strings)))
+    for num_strings in (10, 11, 12)}
+# a result is reported as a regression when its wall time or peak memory grows by more than this factor over baseline
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+# wall time growth smaller than this (s) is never reported as a regression, however large the factor
+DEFAULT_NOISE_FLOOR = 0.01
+# timed runs of each benchmark; the fastest is reported, as the one least disturbed by the rest of the machine
+DEFAULT_REPEATS = 5
+
+
+def count_candidate_voicings(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int = 2,
+        starting_string_idx: int = 0,
+) -> int:
+    """
+    Gets the number of candidate voicings build_chord_better generates before applying its rules: for every fret range,
+        every string subset of at least the minimum size times every combination of chord frets on it
+    """
+    _, chord_frets_in_fret_ranges, _, _ = get_chord_fret_candidates(
+        semitones_in_instrument, semitones_in_chord, range_above_below, starting_string_idx)
+    minimum_search_strings = len(semitones_in_chord) - 1
+
+    num_candidates = 0
+    for chord_frets_in_this_fret_range in chord_frets_in_fret_ranges:
+        # combinations over string subsets of each size, built up one string at a time
+        subset_size_combinations: list[int] = [1]
+        for string_frets in chord_frets_in_this_fret_range:
+            subset_size_combinations = [
+                (subset_size_combinations[size] if size < len(subset_size_combinations) else 0)
+                + (subset_size_combinations[size - 1] * len(string_frets) if size > 0 else 0)
+                for size in range(len(subset_size_combinations) + 1)]
+        num_candidates += sum(subset_size_combinations[minimum_search_strings:])
+
+    return num_candidates
+
+
+def run_chord_benchmark(
+        num_frets: int,
+        tuning: str,
+        engine: str,
+        chord_roots: list[str],
+        chord_types: list[str],
+        measure_memory: bool = True,
+        repeats: int = DEFAULT_REPEATS,
+) -> dict[str, float | int | dict[str, float]]:
+    """
+    Runs a chord engine over every root, chord type and starting string of an instrument
+    :param repeats: Number of timed runs; the fastest is reported
+    :return: fastest wall time (s), candidates of the brute-force cartesian expansion (the same for every engine; see
+        count_candidate_voicings), peak traced memory (bytes) and voicings found, plus the time spent in each phase
+        for build_chord_better (see SearchStats)
+    """
+    build_chord = chord_engines.get(engine)
+    semitones_from_c: list[list[int]] = get_instrument_semitones_from_c(num_frets, tuning.split("-"))
+    chord_searches: list[tuple[list[int], int]] = [
+        (semitones_in_chord, starting_idx)
+        for chord_root in chord_roots
+        for chord_type in chord_types
+        for semitones_in_chord in [convert_chord_to_semitones(chord_type, chord_root)]
+        for starting_idx in range(len(semitones_from_c) - len(semitones_in_chord) + 1)]
+
+    def run_chord_searches():
+        for semitones_in_chord, starting_idx in chord_searches:
+            build_chord(semitones_from_c, semitones_in_chord, starting_string_idx=starting_idx)
+
+    wall_time = min(timeit.repeat(run_chord_searches, number=1, repeat=repeats))
+
+    # counted on a separate run, so that instrumentation is not timed; only build_chord_better is instrumented
+    stats_kwargs = {'stats': SearchStats()} if build_chord is build_chord_better else dict()
+    num_voicings = 0
+    for semitones_in_chord, starting_idx in chord_searches:
+        fretted_voicings, barre_voicings = build_chord(
+            semitones_from_c, semitones_in_chord, starting_string_idx=starting_idx, **stats_kwargs)
+        num_voicings += len(fretted_voicings) + len(barre_voicings)
+
+    # traced separately, since tracing slows the engines down several times over
+    peak_memory = 0
+    if measure_memory:
+        tracemalloc.start()
+        run_chord_searches()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    num_candidates = sum(
+        count_candidate_voicings(semitones_from_c, semitones_in_chord, starting_string_idx=starting_idx)
+        for semitones_in_chord, starting_idx in chord_searches)
+
+    result = {'wall_time': wall_time,
+              'cartesian_candidates': num_candidates,
+              'peak_memory': peak_memory,
+              'voicings': num_voicings,
+              }
+    if stats_kwargs:
+        result.update({'phase_times': stats_kwargs.get('stats').phase_times})
+
+    return result
+
+
+def run_instrument_benchmark(
+        num_frets: int,
+        tuning: str,
+        search: str,
+        chord_roots: list[str],
+        chord_types: list[str],
+        measure_memory: bool = True,
+        repeats: int = DEFAULT_REPEATS,
+) -> dict[str, float | int]:
+    """
+    Runs a whole-instrument search (see instrument_searches) over every root and chord type of an instrument, in the
+        order a user sweeping roots would
+    :param repeats: Number of timed runs; the fastest is reported
+    :return: as run_chord_benchmark, without phase times
+    """
+    search_options = instrument_searches.get(search)
+    semitones_from_c: list[list[int]] = get_instrument_semitones_from_c(num_frets, tuning.split("-"))
+    chords: list[list[int]] = [
+        convert_chord_to_semitones(chord_type, chord_root)
+        for chord_type in chord_types
+        for chord_root in chord_roots]
+    executor = ProcessPoolExecutor(max_workers=os.cpu_count()) if search_options.get('executor') else None
+
+    def run_instrument_searches() -> int:
+        num_voicings = 0
+        for semitones_in_chord in chords:
+            voicings = iter_instrument_chord_voicings(semitones_from_c, semitones_in_chord, executor=executor)
+            if search_options.get('top_k') is not None:
+                voicings = select_top_voicings(voicings, search_options.get('top_k'))
+            num_voicings += sum(1 for _ in voicings)
+
+        return num_voicings
+
+    try:
+        wall_time = min(timeit.repeat(run_instrument_searches, number=1, repeat=repeats))
+        num_voicings = run_instrument_searches()
+
+        peak_memory = 0
+        if measure_memory:
+            tracemalloc.start()
+            run_instrument_searches()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    num_candidates = sum(
+        count_candidate_voicings(semitones_from_c, semitones_in_chord, starting_string_idx=starting_idx)
+        for semitones_in_chord in chords
+        for starting_idx in range(len(semitones_from_c) - len(semitones_in_chord) + 1))
+
+    return {'wall_time': wall_time,
+            'cartesian_candidates': num_candidates,
+            'peak_memory': peak_memory,
+            'voicings': num_voicings,
+            }
+
+
+def compare_to_baseline(
+        results: dict[str, dict[str, dict[str, float | int]]],
+        baseline: dict[str, dict[str, dict[str, float | int]]],
+        regression_threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+        noise_floor: float = DEFAULT_NOISE_FLOOR,
+) -> list[str]:
+    """
+    Compares benchmark results to a baseline run
+    :param noise_floor: Wall time growth (s) below which wall time is never a regression
+    :return: description of every regression: wall time or peak memory up by more than regression_threshold (wall time
+        also by more than noise_floor), or different voicing counts
+    """
+    regressions: list[str] = list()
+    for instrument, engine_results in results.items():
+        for engine, result in engine_results.items():
+            baseline_result = baseline.get(instrument, dict()).get(engine)
+            if baseline_result is None:
+                continue
+            if result['voicings'] != baseline_result['voicings']:
+                regressions.append(
+                    f"{instrument}, {engine}: {result['voicings']} voicings, baseline {baseline_result['voicings']}")
+            for measure in ('wall_time', 'peak_memory'):
+                if measure == 'wall_time' and result[measure] - baseline_result[measure] < noise_floor:
+                    continue
+                if baseline_result[measure] and result[measure] > regression_threshold * baseline_result[measure]:
+                    regressions.append(
+                        f"{instrument}, {engine}: {measure} {result[measure] / baseline_result[measure]:.2f}x baseline")
+
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times the chord engines and whole-instrument searches on every "
+                                                 "instrument preset and synthetic 10-12 string instruments, over all "
+                                                 "chord types and roots.")
+    parser.add_argument("--engines", nargs="+", default=["backtracking", "instrument"],
+                        choices=list(chord_engines.keys()) + list(instrument_searches.keys()))
+    parser.add_argument("--instruments", nargs="+", help="instrument names to run (default all)")
+    parser.add_argument("--roots", nargs="+", default=[index_to_note.get(root_idx) for root_idx in range(12)])
+    parser.add_argument("--chord-types", nargs="+", default=list(chords_to_intervals.keys()))
+    parser.add_argument("--skip-memory", action="store_true", help="skip the traced run measuring peak memory")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to save results")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR,
+                        help="wall time growth (s) never reported as a regression")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed runs of each benchmark")
+    args = parser.parse_args()
+
+    instruments = {**instrument_presets, **synthetic_instruments}
+    instrument_names = args.instruments if args.instruments is not None else list(instruments.keys())
+
+    results: dict[str, dict[str, dict[str, float | int]]] = dict()
+    for instrument_name in instrument_names:
+        num_frets, tuning = instruments[instrument_name]
+        for engine in args.engines:
+            run_benchmark = run_chord_benchmark if engine in chord_engines else run_instrument_benchmark
+            result = run_benchmark(
+                num_frets, tuning, engine, args.roots, args.chord_types, measure_memory=not args.skip_memory,
+                repeats=args.repeats)
+            results.setdefault(instrument_name, dict()).update({engine: result})
+            print(f"{instrument_name:<24} {engine:<22} {result['wall_time']:>9.3f} s "
+                  f"{result['cartesian_candidates']:>13} cartesian candidates "
+                  f"{result['peak_memory'] / 2 ** 20:>9.1f} MiB {result['voicings']:>9} voicings",
+                  flush=True)
+
+    with open(args.output, "w") as output_file:
+        json.dump({'python': platform.python_version(),
+                   'machine': platform.machine(),
+                   'roots': args.roots,
+                   'chord_types': args.chord_types,
+                   'repeats': args.repeats,
+                   'results': results,
+                   }, output_file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            regressions = compare_to_baseline(
+                results, json.load(baseline_file)['results'], args.threshold, args.noise_floor)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
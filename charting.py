@@ -1,5 +1,9 @@
 from chord_dicts import note_to_index, interval_to_integer, chords_to_intervals, sharp_to_flat, intervals_in_scales
-from typing import Literal
+from typing import Literal, Iterable
+
+
+# note letters in order up from C, for spelling chord notes by their interval number
+note_letters = "CDEFGAB"
 
 
 def convert_chord_to_semitones(
@@ -22,6 +26,94 @@ def convert_chord_to_semitones(
     return interval_semitones
 
 
+def get_semitones_mask(semitones: Iterable[int]) -> int:
+    """
+    Gets the 12-bit pitch class mask of some semitones from C, with bit n set for n semitones from C. Membership is then
+        1 << semitone & mask, and a set of notes covers a chord when chord_mask & ~notes_mask == 0.
+    """
+    semitones_mask = 0
+    for semitone in semitones:
+        semitones_mask |= 1 << semitone
+
+    return semitones_mask
+
+
+def convert_chord_to_mask(
+        chord_type: str,
+        chord_root: str,
+) -> int:
+    """
+    convert_chord_to_semitones as a 12-bit pitch class mask (see get_semitones_mask)
+    """
+    return get_semitones_mask(convert_chord_to_semitones(chord_type, chord_root))
+
+
+def convert_slash_chord_to_semitones(
+        chord_type: str,
+        chord_root: str,
+        bass_note: str,
+) -> list[int]:
+    """
+    Gets semitones from C for each interval in a chord voiced over a bass note, bass note first. Chord searches voice
+        the first semitone on the lowest string, so a chord note as the bass gives an inversion (ex. C/E), and any
+        other note adds itself below the chord (ex. C/D).
+    :param chord_type: Type of chord (see chord_dicts.chords_to_intervals)
+    :param chord_root: Root note
+    :param bass_note: Lowest note of the voicing
+    :return:
+    """
+    interval_semitones = convert_chord_to_semitones(chord_type, chord_root)
+    bass_semitones = note_to_index.get(bass_note)
+    assert bass_semitones is not None, f"Bass note {bass_note} not recognized!"
+    if bass_semitones in interval_semitones:
+        interval_semitones.remove(bass_semitones)
+
+    return [bass_semitones] + interval_semitones
+
+
+def spell_chord_note(
+        chord_root: str,
+        interval: str,
+) -> str:
+    """
+    Names the note an interval above a chord root, spelled from the root's letter where note_to_index allows: ex. the
+        3 of C is E rather than Fb, and the b3 of Eb is Gb rather than F#
+    :param chord_root: Root note
+    :param interval: Interval from the root (see chord_dicts.interval_to_integer)
+    :return: a note of note_to_index
+    """
+    note_semitones = (note_to_index.get(chord_root) + interval_to_integer.get(interval)) % 12
+    enharmonic_notes = [note for note, note_index in note_to_index.items() if note_index == note_semitones]
+    note_letter = note_letters[(note_letters.index(chord_root[0]) + int(interval.lstrip("b")) - 1) % 7]
+    # otherwise keep to the root's accidental, or a natural
+    root_accidental = chord_root[1:]
+    for note in enharmonic_notes:
+        if note[0] == note_letter:
+            return note
+    for note in enharmonic_notes:
+        if note[1:] in (root_accidental, ""):
+            return note
+
+    return enharmonic_notes[0]
+
+
+def get_chord_inversion_bass_notes(
+        chord_type: str,
+        chord_root: str,
+) -> list[str]:
+    """
+    Gets the bass note of each inversion of a chord, root position first
+    :return: each distinct chord note, in interval order, spelled by spell_chord_note
+    """
+    chord_intervals: list[str] = chords_to_intervals.get(chord_type)
+    assert chord_intervals is not None, f"Chord type {chord_type} not recognized!"
+    bass_notes_by_semitones: dict[int, str] = dict()
+    for interval in chord_intervals:
+        bass_notes_by_semitones.setdefault(interval_to_integer.get(interval), spell_chord_note(chord_root, interval))
+
+    return list(bass_notes_by_semitones.values())
+
+
 def convert_scale_to_semitones(
         scale_type: str,
         scale_root: str,
@@ -264,6 +356,7 @@ def build_scale(
     ) -> list[list[int, int]]:
 
     string_fret_pairs = list()
+    scale_mask = get_semitones_mask(scale_intervals)
 
     string_index: int = 0
     for single_string_intervals in all_string_intervals:
@@ -271,7 +364,7 @@ def build_scale(
         fret_index: int = 0
         for interval in single_string_intervals:
 
-            if interval in scale_intervals:
+            if 1 << interval & scale_mask:
                 pair: list[int, int] = [fret_index, string_index]
                 string_fret_pairs.append(pair)
 
@@ -1,5 +1,93 @@
 from itertools import (combinations,  # for getting all possible subsets of strings to use in voicing a chord
-                       compress)  # for indexing a list using bool array
+                       compress,  # for indexing a list using bool array
+                       chain,
+                       repeat,
+                       groupby)
+from operator import itemgetter
+from heapq import merge
+from concurrent.futures import Executor
+from typing import Iterable
+from time import perf_counter, monotonic
+
+from charting import get_semitones_mask
+from voicing_encoding import encode_voicing, get_voicing_sort_key
+
+
+class SearchStats:
+    """
+    Counters and per-phase timings of chord searches, summed over every search it is passed to. Searches only touch it
+        when one is passed, so leaving it out costs a None check per event.
+    """
+
+    def __init__(self):
+        # number of items produced or rejected at each step, by counter name
+        self.counts: dict[str, int] = dict()
+        # seconds spent in each phase, by phase name
+        self.phase_times: dict[str, float] = dict()
+        self.current_phase: str | None = None
+        self.phase_start_time = 0.0
+
+    def count(
+            self,
+            counter: str,
+            num: int = 1,
+    ) -> None:
+        self.counts[counter] = self.counts.get(counter, 0) + num
+
+        return
+
+    def start_phase(self, phase: str | None) -> None:
+        """
+        Ends the current phase, adding its time, and starts timing the next
+        :param phase: Name of the next phase, or None to stop timing
+        """
+        now = perf_counter()
+        if self.current_phase is not None:
+            self.phase_times[self.current_phase] = \
+                self.phase_times.get(self.current_phase, 0.0) + now - self.phase_start_time
+        self.current_phase = phase
+        self.phase_start_time = now
+
+        return
+
+    def __repr__(self) -> str:
+        lines: list[str] = [f"{phase}: {phase_time:.4f} s" for phase, phase_time in self.phase_times.items()]
+        lines += [f"{counter}: {count}" for counter, count in self.counts.items()]
+
+        return "\n".join(lines)
+
+
+class SearchBudget:
+    """
+    Deadline and cancellation for a chord search. Searches check it before each fret range and after each voicing they
+        yield, and stop once it is exhausted, keeping what they have found so far.
+    """
+
+    def __init__(
+            self,
+            deadline: float | None = None,
+            cancel_event=None,
+    ):
+        """
+        :param deadline: time.monotonic() time to stop searching at. Default None (no deadline).
+        :param cancel_event: threading.Event or anything else with is_set(); the search stops once it is set. Default
+            None (cannot be cancelled).
+        """
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        # whether a search was stopped by this budget, i.e. its result is partial
+        self.is_exhausted = False
+
+    def check(self) -> bool:
+        """
+        :return: whether the search should stop
+        """
+        if not self.is_exhausted:
+            self.is_exhausted = (
+                (self.cancel_event is not None and self.cancel_event.is_set())
+                or (self.deadline is not None and monotonic() >= self.deadline))
+
+        return self.is_exhausted
 
 
 def filter_instrument_range(
@@ -18,6 +106,7 @@ def get_allowed_fret_ranges(
         required_first_string_fret: int,
         range_above_below: int,
         num_frets: int,
+        stats: SearchStats | None = None,
 ) -> tuple[list[list[int]], list[bool]]:
 
     allowed_fret_range = 2 * range_above_below
@@ -44,16 +133,19 @@ def get_allowed_fret_ranges(
             for i in range(max(1, required_first_string_fret - allowed_fret_range), required_first_string_fret + 1)]
         range_is_hi_arr: list[bool] = [False for _ in range(len(possible_ranges))]
 
+    if stats is not None:
+        stats.count("fret_ranges", len(possible_ranges))
+
     return possible_ranges, range_is_hi_arr
 
 
-def build_chord_better(
+def get_chord_fret_candidates(
         semitones_in_instrument: list[list[int]],
         semitones_in_chord: list[int],
-        range_above_below = 2,
-        starting_string_idx = 0,
-#    ------ fretted chord part -------  ------------------- barred chord part --------------------
-) -> tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]:
+        range_above_below: int = 2,
+        starting_string_idx: int = 0,
+        stats: SearchStats | None = None,
+) -> tuple[list[int], list[list[list[int]]], list[list[list[int]]], int]:
 
     num_frets, num_strings = len(semitones_in_instrument[0]), len(semitones_in_instrument)
     num_strings = num_strings - starting_string_idx
@@ -63,7 +155,8 @@ def build_chord_better(
     required_first_string_fret = first_string_semitones.index(root_note, 0, 12)
 
     # apply condition 1: the root note must be in the allowed range of the first string
-    possible_fret_ranges, root_is_hi_bool_arr = get_allowed_fret_ranges(required_first_string_fret, range_above_below, num_frets)
+    possible_fret_ranges, root_is_hi_bool_arr = get_allowed_fret_ranges(
+        required_first_string_fret, range_above_below, num_frets, stats)
 
     semitones_in_possible_fret_ranges = [[[
         string_semitones[fret]
@@ -75,24 +168,27 @@ def build_chord_better(
     remaining_notes = semitones_in_chord[1:]
     for fret_range_idx, strings_semitones in enumerate(semitones_in_possible_fret_ranges):
 
+        fret_range_mask = get_semitones_mask(chain.from_iterable(strings_semitones))
         for remaining_note in remaining_notes:
-            note_is_in_string = [remaining_note in string_semitones for string_semitones in strings_semitones]
-            if not any(note_is_in_string):
+            if not 1 << remaining_note & fret_range_mask:
                 # we know that at least one of the notes in the chord we want to form is not present across any of these
                 # strings at this fret range; remove this range from consideration
                 semitones_in_possible_fret_ranges.remove(strings_semitones)
                 possible_fret_ranges.pop(fret_range_idx)
+                if stats is not None:
+                    stats.count("fret_ranges_rejected_condition_2")
                 break
 
     # now we know the ranges may all potentially give valid chords:
     # we must find the indices on each string which have a note in the chord
+    chord_mask = get_semitones_mask(semitones_in_chord)
     any_chord_note_is_on_fret: list[list[list[bool]]] = list()
     for strings_semitones in semitones_in_possible_fret_ranges:
         possible_fret_range_note_idx_array: list[list[bool]] = list()
 
         for string_semitones in strings_semitones:
             fret_is_in_chord: list[bool] = [
-                fret_semitone in semitones_in_chord
+                bool(1 << fret_semitone & chord_mask)
                 for fret_semitone in string_semitones]
             possible_fret_range_note_idx_array.append(fret_is_in_chord)
 
@@ -119,6 +215,36 @@ def build_chord_better(
         chord_semitones_in_fret_ranges.append(chord_semitones_in_this_fret_range)
         chord_frets_in_fret_ranges.append(chord_frets_in_this_fret_range)
 
+    # ex. if the root is F and the first open string is E, there are different chords available with the root
+    # voiced on the 1st vs. the 13th fret; here we keep track of which root gave rise to which range
+    root_frets_in_fret_ranges: list[int] = [
+        required_first_string_fret + 12 * int(root_is_hi_bool_arr[idx])
+        for idx in range(len(chord_frets_in_fret_ranges))]
+
+    return root_frets_in_fret_ranges, chord_frets_in_fret_ranges, chord_semitones_in_fret_ranges, num_strings
+
+
+def build_chord_better(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below = 2,
+        starting_string_idx = 0,
+        stats: SearchStats | None = None,
+#    ------ fretted chord part -------  ------------------- barred chord part --------------------
+) -> tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]:
+    """
+    :param stats: If given, counts of the candidates each phase produces and each rule rejects, and the time spent in
+        each phase, are added to it. Default None.
+    """
+    if stats is not None:
+        stats.start_phase("fret_range_filtering")
+    root_frets_in_fret_ranges, chord_frets_in_fret_ranges, chord_semitones_in_fret_ranges, num_strings = \
+        get_chord_fret_candidates(
+            semitones_in_instrument, semitones_in_chord, range_above_below, starting_string_idx, stats)
+    remaining_notes = semitones_in_chord[1:]
+    if stats is not None:
+        stats.start_phase("subset_expansion")
+
     # we need to get allowed subsets of strings to use to form chords;
     # the minimum number of strings needed is len(remaining_notes);
     # the maximum number of strings allowed is num_strings
@@ -139,6 +265,10 @@ def build_chord_better(
         for subset in string_subsets:
             all_string_subsets.append(subset)
 
+    if stats is not None:
+        stats.count("string_subsets", len(all_string_subsets))
+        stats.start_phase("cartesian_expansion")
+
     # repeat chord procedure across all subsets
     for string_subset in all_string_subsets:
 
@@ -215,10 +345,7 @@ def build_chord_better(
     for fret_range_idx, fret_range_semitone_split in enumerate(all_subsets_string_semitone_combinations):
         for string_subset_idx, string_subset_fret_range_semitone_split in enumerate(fret_range_semitone_split):
 
-            # ex. if the root is F and the first open string is E, there are different chords available with the root
-            # voiced on the 1st vs. the 13th fret; here we keep track of which root gave rise to which range
-            range_uses_hi_root = root_is_hi_bool_arr[string_subset_idx]
-            root_fret: int = required_first_string_fret + 12 * int(range_uses_hi_root)
+            root_fret: int = root_frets_in_fret_ranges[string_subset_idx]
 
             for combination_idx, semitone_combination_split in enumerate(string_subset_fret_range_semitone_split):
 
@@ -244,6 +371,11 @@ def build_chord_better(
                 master_combination_string_fret_tuples.append(this_combination_string_fret_tuples)
                 master_combination_string_semitone_tuples.append(this_combination_string_semitone_tuples)
 
+    if stats is not None:
+        stats.count("candidates", len(master_combination_string_fret_tuples))
+        stats.start_phase("rule_filtering")
+
+    chord_mask = get_semitones_mask(semitones_in_chord)
     validated_chord_string_fret_tuples: list[list[tuple[int, int]]] = list()
     validated_barre_string_fret_tuples: list[list[tuple[int, int]]] = list()
     for combination_idx, string_semitone_tuples in enumerate(master_combination_string_semitone_tuples):
@@ -255,7 +387,9 @@ def build_chord_better(
         # apply rule 1: each semitone in the chord must be represented in the combination
         semitones_in_combination = [string_semitone_tuple[1] for string_semitone_tuple in string_semitone_tuples]
         frets_in_combination = [string_fret_tuple[1] for string_fret_tuple in string_fret_tuples]
-        if not all([chord_semitone in semitones_in_combination for chord_semitone in semitones_in_chord]):
+        if chord_mask & ~get_semitones_mask(semitones_in_combination):
+            if stats is not None:
+                stats.count("rejected_rule_1")
             continue
 
         # apply rule 2: notes on consecutive strings may not be identical
@@ -283,23 +417,472 @@ def build_chord_better(
         num_fretted_voicing_notes = num_voicing_notes - frets_in_combination.count(0)
         # if not valid barre, remove all entries with more than 4 fretted notes
         if num_fretted_voicing_notes > 4:
+            if stats is not None:
+                stats.count("rejected_rule_3")
             continue
 
         validated_chord_string_fret_tuples.append(string_fret_tuples)
 
-    validated_chord_string_fret_tuples = list(
-        list(x)
-        for x in set(frozenset(x)
-        for x in validated_chord_string_fret_tuples))
-    validated_barre_string_fret_tuples = list(
-        list(x)
-        for x in set(frozenset(x)
-        for x in validated_barre_string_fret_tuples))
+    if stats is not None:
+        stats.count("fretted_voicings_found", len(validated_chord_string_fret_tuples))
+        stats.count("barre_voicings_found", len(validated_barre_string_fret_tuples))
+        stats.start_phase("deduplication")
+
+    validated_chord_string_fret_tuples = canonicalize_voicings(validated_chord_string_fret_tuples)
+    validated_barre_string_fret_tuples = canonicalize_voicings(validated_barre_string_fret_tuples)
 
     handled_validated_barre_string_fret_tuples: list[tuple[list[tuple[int, int]], list[tuple[int, int]]]] = [
         handle_barre_chord(barre_chord) for barre_chord in validated_barre_string_fret_tuples
     ]
 
+    if stats is not None:
+        stats.count("fretted_voicings", len(validated_chord_string_fret_tuples))
+        stats.count("barre_voicings", len(handled_validated_barre_string_fret_tuples))
+        stats.start_phase(None)
+
+    return validated_chord_string_fret_tuples, handled_validated_barre_string_fret_tuples
+
+
+def canonicalize_voicings(voicings: Iterable[list[tuple[int, int]]]) -> list[list[tuple[int, int]]]:
+    """
+    Removes repeated voicings and puts the rest in canonical order (see voicing_encoding.get_voicing_sort_key), so that
+        the same chord always gives the same list however it was searched.
+    :param voicings: Voicings as lists of (string, fret) tuples
+    :return: unique voicings in canonical order
+    """
+    # deduplicate on packed voicing keys rather than hashing frozensets of tuples
+    voicings_by_key: dict[int, list[tuple[int, int]]] = dict()
+    for string_fret_tuples in voicings:
+        voicings_by_key.setdefault(encode_voicing(string_fret_tuples), string_fret_tuples)
+
+    return [voicings_by_key[voicing_key] for voicing_key in sorted(voicings_by_key, key=get_voicing_sort_key)]
+
+
+def get_canonical_voicing_key(voicing: tuple[list[tuple[int, int]], bool]) -> tuple[int, ...]:
+    """
+    Gets the canonical order key of a (string_fret_tuples, is_barre) voicing; see voicing_encoding.get_voicing_sort_key
+    """
+    return get_voicing_sort_key(encode_voicing(voicing[0]))
+
+
+def get_string_fret_tuples_sort_key(voicing: tuple[list[tuple[int, int]], bool]) -> list[tuple[int, int]]:
+    """
+    Gets a key putting (string_fret_tuples, is_barre) voicings in canonical order, like get_canonical_voicing_key but
+        without packing voicing keys; string_fret_tuples must be listed by string, as the searches list them. A string
+        played in one voicing and muted in the other comes first in the other, so string numbers are negated to make
+        the tuple of the voicing playing it compare higher.
+    """
+    return [(-string, fret) for string, fret in voicing[0]]
+
+
+def iter_fret_range_voicings(
+        root_fret: int,
+        chord_frets_in_this_fret_range: list[list[int]],
+        chord_semitones_in_this_fret_range: list[list[int]],
+        semitones_in_chord: list[int],
+        starting_string_idx: int = 0,
+        required_string: int | None = None,
+):
+    """
+    Depth-first search over the strings above the starting string for a single fret range, yielding each voicing which
+        passes the playability rules of build_chord_better as (string_fret_tuples, is_barre). A partial voicing is
+        abandoned as soon as the strings left to fret can no longer complete the chord or keep it playable.
+    :param root_fret: Fret of the root note on the starting string
+    :param chord_frets_in_this_fret_range: Frets holding a chord note, for each string above the starting string
+    :param chord_semitones_in_this_fret_range: Semitones from C at the frets above
+    :param semitones_in_chord: Semitones from C in the chord, bass note (usually the root) first
+    :param starting_string_idx: Index of the string holding the root
+    :param required_string: Only yield voicings playing this string. Default None.
+    :return: generator of (string_fret_tuples, is_barre), in canonical order: strings are visited from the lowest up,
+        each left unplayed before its frets are tried from the lowest up
+    """
+    num_search_strings = len(chord_frets_in_this_fret_range)
+    # build_chord_better only forms string subsets with at least this many strings above the starting string
+    minimum_search_strings = len(semitones_in_chord) - 1
+
+    chord_mask = get_semitones_mask(semitones_in_chord)
+
+    # chord notes still reachable on each string and every string above it; used to abandon partial voicings which
+    # cannot be completed
+    reachable_masks: list[int] = [0] * (num_search_strings + 1)
+    for string in reversed(range(num_search_strings)):
+        reachable_masks[string] = reachable_masks[string + 1] | get_semitones_mask(
+            chord_semitones_in_this_fret_range[string])
+
+    string_fret_tuples: list[tuple[int, int]] = [(starting_string_idx, root_fret)]
+
+    def search(
+            string: int,
+            covered_mask: int,
+            num_fretted: int,
+            has_open: bool,
+            is_consecutive: bool,
+            min_fret: int,
+            num_min_fret: int,
+    ):
+        num_voicing_notes = len(string_fret_tuples)
+        num_remaining_strings = num_search_strings - string
+
+        # too few strings left to reach the minimum subset size
+        if num_voicing_notes - 1 + num_remaining_strings < minimum_search_strings:
+            return
+        # a missing chord note is not available on any of the remaining strings
+        if chord_mask & ~covered_mask & ~reachable_masks[string]:
+            return
+        # too many fretted notes for a fretted chord, and the barre conditions can no longer be met: open strings and
+        # gaps are permanent, and the count of notes off the lowest fret can only grow
+        if num_fretted > 4 and (has_open or not is_consecutive or num_voicing_notes - num_min_fret > 3):
+            return
+
+        if string == num_search_strings:
+            if covered_mask & chord_mask != chord_mask:
+                return
+            if not has_open and is_consecutive and num_min_fret > 1 and num_voicing_notes - num_min_fret <= 3:
+                yield list(string_fret_tuples), True
+            elif num_fretted <= 4:
+                yield list(string_fret_tuples), False
+            return
+
+        # leave this string unplayed
+        if string + starting_string_idx + 1 != required_string:
+            yield from search(
+                string + 1, covered_mask, num_fretted, has_open, is_consecutive, min_fret, num_min_fret)
+
+        # or play any chord note available on it; playing a string above an unplayed one breaks the consecutive run
+        # of strings a barre requires
+        string_is_consecutive = is_consecutive and num_voicing_notes == string + 1
+        for fret, semitone in zip(chord_frets_in_this_fret_range[string], chord_semitones_in_this_fret_range[string]):
+            if fret < min_fret:
+                next_min_fret, next_num_min_fret = fret, 1
+            elif fret == min_fret:
+                next_min_fret, next_num_min_fret = min_fret, num_min_fret + 1
+            else:
+                next_min_fret, next_num_min_fret = min_fret, num_min_fret
+
+            string_fret_tuples.append((string + starting_string_idx + 1, fret))
+            yield from search(
+                string + 1,
+                covered_mask | 1 << semitone,
+                num_fretted + int(fret != 0),
+                has_open or fret == 0,
+                string_is_consecutive,
+                next_min_fret,
+                next_num_min_fret,
+            )
+            string_fret_tuples.pop()
+
+    yield from search(
+        0,
+        1 << semitones_in_chord[0],
+        int(root_fret != 0),
+        root_fret == 0,
+        True,
+        root_fret,
+        1,
+    )
+
+
+def iter_chord_voicings(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int = 2,
+        starting_string_idx: int = 0,
+        limit: int | None = None,
+        fret_range_idx: int | None = None,
+        required_string: int | None = None,
+        budget: SearchBudget | None = None,
+):
+    """
+    Yields each voicing found by build_chord_better as soon as the search reaches it, without holding the candidates
+        or the other voicings in memory. Each fret range is searched in canonical order (see iter_fret_range_voicings),
+        and the fret ranges are merged as they go, so voicings come out in canonical order without being sorted.
+    :param semitones_in_instrument: Semitones from C for each fret of each string
+    :param semitones_in_chord: Semitones from C in the chord, bass note (usually the root) first
+    :param range_above_below: Half-width of the allowed fret range
+    :param starting_string_idx: Index of the string holding the root
+    :param limit: Stop after this many voicings. Default None (no limit).
+    :param fret_range_idx: Only search this fret range, indexed as in get_chord_fret_candidates. Default None (search
+        every fret range).
+    :param required_string: Only yield voicings playing this string. Default None.
+    :param budget: Stop once the budget is exhausted. Default None (search everything).
+    :return: generator of (string_fret_tuples, is_barre), in canonical order; barre voicings can be split with
+        handle_barre_chord
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    root_frets_in_fret_ranges, chord_frets_in_fret_ranges, chord_semitones_in_fret_ranges, _ = \
+        get_chord_fret_candidates(semitones_in_instrument, semitones_in_chord, range_above_below, starting_string_idx)
+    chord_fret_sets_in_fret_ranges: list[list[set[int]]] = [
+        [set(string_frets) for string_frets in chord_frets_in_this_fret_range]
+        for chord_frets_in_this_fret_range in chord_frets_in_fret_ranges]
+
+    def iter_fret_range_new_voicings(idx: int, root_fret: int):
+        if budget is not None and budget.check():
+            return
+        fret_range_search_args = (
+            root_fret,
+            chord_frets_in_fret_ranges[idx],
+            chord_semitones_in_fret_ranges[idx],
+            semitones_in_chord,
+            starting_string_idx,
+        )
+        for string_fret_tuples, is_barre in iter_fret_range_voicings(
+                *fret_range_search_args, required_string=required_string):
+            # overlapping fret ranges find some voicings more than once; only the first range able to form a voicing
+            # yields it, so no record of yielded voicings needs to be kept
+            found_in_earlier_range = any(
+                root_frets_in_fret_ranges[earlier_idx] == root_fret and all(
+                    fret in chord_fret_sets_in_fret_ranges[earlier_idx][string - starting_string_idx - 1]
+                    for string, fret in string_fret_tuples[1:])
+                for earlier_idx in range(idx))
+            if found_in_earlier_range:
+                continue
+
+            yield string_fret_tuples, is_barre
+
+    num_voicings = 0
+    for voicing in merge(
+            *(iter_fret_range_new_voicings(idx, root_fret)
+              for idx, root_fret in enumerate(root_frets_in_fret_ranges)
+              if fret_range_idx is None or idx == fret_range_idx),
+            key=get_string_fret_tuples_sort_key,
+    ):
+        yield voicing
+        num_voicings += 1
+        if num_voicings == limit:
+            return
+        if budget is not None and budget.check():
+            return
+
+
+def find_fret_range_voicings(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int,
+        starting_string_idx: int,
+        fret_range_idx: int,
+) -> list[tuple[list[tuple[int, int]], bool]]:
+    """
+    Process pool task for iter_instrument_chord_voicings: the voicings iter_chord_voicings yields from one fret range.
+    """
+    return list(iter_chord_voicings(
+        semitones_in_instrument,
+        semitones_in_chord,
+        range_above_below,
+        starting_string_idx,
+        fret_range_idx=fret_range_idx,
+    ))
+
+
+def iter_instrument_chord_voicings(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int = 2,
+        executor: Executor | None = None,
+        budget: SearchBudget | None = None,
+):
+    """
+    Yields the voicings of iter_chord_voicings for every starting string with enough strings above it to form the
+        chord, in canonical order (see voicing_encoding.get_voicing_sort_key). Voicings are yielded as they are found,
+        unless an executor is given.
+    :param executor: If given, each (starting string, fret range) pair is searched as a separate task on it, and each
+        starting string's voicings are yielded once all of its tasks are done. Default None.
+    :param budget: If it is exhausted, the search stops after the voicings found so far; budget.is_exhausted then marks
+        the result as partial. Default None (search everything).
+    """
+    minimum_strings_needed = len(semitones_in_chord)
+    # repeat the procedure until we use the very least number of strings needed to form the chord
+    starting_idxs = range(len(semitones_in_instrument) - minimum_strings_needed + 1)
+
+    if executor is None:
+        starting_string_voicings = (
+            iter_chord_voicings(
+                semitones_in_instrument,
+                semitones_in_chord,
+                range_above_below,
+                starting_string_idx=starting_idx,
+                budget=budget,
+            )
+            for starting_idx in starting_idxs
+        )
+    else:
+        starting_string_voicings = iter_executor_chord_voicings(
+            semitones_in_instrument, semitones_in_chord, range_above_below, starting_idxs, executor, budget)
+
+    # canonical order is lowest played string first, so the starting strings, each in canonical order, follow each
+    # other. iter_chord_voicings yields each voicing once, and voicings of different starting strings differ in their
+    # lowest string, so nothing needs deduplicating
+    for voicings in starting_string_voicings:
+        yield from voicings
+        if budget is not None and budget.is_exhausted:
+            return
+
+
+def iter_executor_chord_voicings(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int,
+        starting_idxs: Iterable[int],
+        executor: Executor,
+        budget: SearchBudget | None = None,
+):
+    """
+    Searches each (starting string, fret range) pair of iter_instrument_chord_voicings as a task on the executor.
+    :param budget: Once it is exhausted, the starting string's voicings collected so far are the last yielded and the
+        remaining tasks are cancelled. Default None.
+    :return: generator of the voicings of each starting string, in canonical order
+    """
+
+    # the lowest starting strings have by far the most string subsets, so splitting them further by fret range keeps
+    # the tasks closer in size
+    task_starting_idxs: list[int] = list()
+    task_fret_range_idxs: list[int] = list()
+    for starting_idx in starting_idxs:
+        root_frets_in_fret_ranges = get_chord_fret_candidates(
+            semitones_in_instrument, semitones_in_chord, range_above_below, starting_idx)[0]
+        for fret_range_idx in range(len(root_frets_in_fret_ranges)):
+            task_starting_idxs.append(starting_idx)
+            task_fret_range_idxs.append(fret_range_idx)
+
+    # map returns results in submission order, so the fret ranges of each starting string arrive together
+    fret_range_voicings = executor.map(
+        find_fret_range_voicings,
+        repeat(semitones_in_instrument),
+        repeat(semitones_in_chord),
+        repeat(range_above_below),
+        task_starting_idxs,
+        task_fret_range_idxs,
+    )
+    for _, starting_string_tasks in groupby(zip(task_starting_idxs, fret_range_voicings), key=itemgetter(0)):
+        starting_string_voicings: list[tuple[list[tuple[int, int]], bool]] = list()
+        for _, voicings in starting_string_tasks:
+            starting_string_voicings.extend(voicings)
+            if budget is not None and budget.check():
+                break
+        yield sorted(starting_string_voicings, key=get_canonical_voicing_key)
+        if budget is not None and budget.is_exhausted:
+            # closing the map cancels the tasks which have not started
+            fret_range_voicings.close()
+            return
+
+
+def iter_retuned_chord_voicings(
+        previous_voicings: Iterable[tuple[list[tuple[int, int]], bool]],
+        previous_semitones_in_instrument: list[list[int]],
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int = 2,
+        budget: SearchBudget | None = None,
+):
+    """
+    Yields the same voicings as iter_instrument_chord_voicings after one string of an instrument has been retuned,
+        reusing those found before it was. Voicings of higher starting strings cannot play the retuned string and are
+        kept as they are. For lower starting strings, a voicing depends only on the strings it plays and on which fret
+        ranges survive condition 2; if the retuning leaves the fret ranges unchanged, only voicings playing the
+        retuned string are searched again.
+    :param previous_voicings: Every voicing of the chord from iter_instrument_chord_voicings, before the retuning
+    :param previous_semitones_in_instrument: Semitones from C for each fret of each string, before the retuning
+    :param semitones_in_instrument: Semitones from C for each fret of each string, after the retuning
+    :param semitones_in_chord: Semitones from C in the chord, bass note (usually the root) first
+    :param range_above_below: Half-width of the allowed fret range; must match the previous search
+    :param budget: Deadline and cancellation, as for iter_instrument_chord_voicings. Default None.
+    :return: generator of (string_fret_tuples, is_barre), in canonical order
+    """
+    retuned_strings: list[int] = [
+        string for string, (previous_string_semitones, string_semitones)
+        in enumerate(zip(previous_semitones_in_instrument, semitones_in_instrument))
+        if previous_string_semitones != string_semitones]
+    if len(semitones_in_instrument) != len(previous_semitones_in_instrument) or len(retuned_strings) > 1:
+        yield from iter_instrument_chord_voicings(
+            semitones_in_instrument, semitones_in_chord, range_above_below, budget=budget)
+        return
+    if not retuned_strings:
+        yield from previous_voicings
+        return
+    retuned_string = retuned_strings[0]
+
+    minimum_strings_needed = len(semitones_in_chord)
+    starting_idxs = range(len(semitones_in_instrument) - minimum_strings_needed + 1)
+
+    # previous voicings arrive in canonical order, which groups them by starting string
+    previous_voicings_by_starting_idx: dict[int, list[tuple[list[tuple[int, int]], bool]]] = {
+        starting_idx: list(voicings)
+        for starting_idx, voicings in groupby(previous_voicings, key=lambda voicing: voicing[0][0][0])}
+
+    for starting_idx in starting_idxs:
+        previous_starting_string_voicings = previous_voicings_by_starting_idx.get(starting_idx, list())
+        if starting_idx > retuned_string:
+            yield from previous_starting_string_voicings
+            continue
+
+        # root frets and chord frets of every other string, for each fret range
+        previous_fret_ranges, fret_ranges = [
+            [(root_fret, chord_frets_in_this_fret_range[:retuned_string - starting_idx - 1]
+              + chord_frets_in_this_fret_range[retuned_string - starting_idx:])
+             for root_fret, chord_frets_in_this_fret_range in zip(*get_chord_fret_candidates(
+                 string_semitones_in_instrument, semitones_in_chord, range_above_below, starting_idx)[:2])]
+            for string_semitones_in_instrument in (previous_semitones_in_instrument, semitones_in_instrument)]
+
+        if starting_idx == retuned_string or previous_fret_ranges != fret_ranges:
+            voicings = list(iter_chord_voicings(
+                semitones_in_instrument,
+                semitones_in_chord,
+                range_above_below,
+                starting_string_idx=starting_idx,
+                budget=budget,
+            ))
+        else:
+            voicings = [
+                voicing for voicing in previous_starting_string_voicings
+                if all(string != retuned_string for string, _ in voicing[0])]
+            voicings.extend(iter_chord_voicings(
+                semitones_in_instrument,
+                semitones_in_chord,
+                range_above_below,
+                starting_string_idx=starting_idx,
+                required_string=retuned_string,
+                budget=budget,
+            ))
+
+        yield from sorted(voicings, key=get_canonical_voicing_key)
+        if budget is not None and budget.is_exhausted:
+            return
+
+
+def build_chord_backtracking(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int = 2,
+        starting_string_idx: int = 0,
+) -> tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]:
+    """
+    Finds the same voicings as build_chord_better, but applies the playability rules while voicings are built instead
+        of filtering every string subset x fret combination afterwards.
+    :param semitones_in_instrument: Semitones from C for each fret of each string
+    :param semitones_in_chord: Semitones from C in the chord, bass note (usually the root) first
+    :param range_above_below: Half-width of the allowed fret range
+    :param starting_string_idx: Index of the string holding the root
+    :return: fretted voicings, barre voicings split by handle_barre_chord
+    """
+    validated_chord_string_fret_tuples: list[list[tuple[int, int]]] = list()
+    validated_barre_string_fret_tuples: list[list[tuple[int, int]]] = list()
+    for string_fret_tuples, is_barre in iter_chord_voicings(
+            semitones_in_instrument,
+            semitones_in_chord,
+            range_above_below,
+            starting_string_idx,
+    ):
+        if is_barre:
+            validated_barre_string_fret_tuples.append(string_fret_tuples)
+        else:
+            validated_chord_string_fret_tuples.append(string_fret_tuples)
+
+    validated_chord_string_fret_tuples = canonicalize_voicings(validated_chord_string_fret_tuples)
+    handled_validated_barre_string_fret_tuples: list[tuple[list[tuple[int, int]], list[tuple[int, int]]]] = [
+        handle_barre_chord(barre_chord) for barre_chord in canonicalize_voicings(validated_barre_string_fret_tuples)
+    ]
+
     return validated_chord_string_fret_tuples, handled_validated_barre_string_fret_tuples
 
 
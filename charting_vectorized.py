@@ -0,0 +1,110 @@
+from charting import get_semitones_mask
+from charting_better import get_chord_fret_candidates, handle_barre_chord, canonicalize_voicings
+from voicing_encoding import encode_voicing, MUTED_FRET
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; charting_better covers the same search without it
+    np = None
+
+
+# number of candidates checked per array operation; bounds memory on instruments with many strings
+CANDIDATES_PER_BLOCK = 1 << 16
+
+
+def build_chord_vectorized(
+        semitones_in_instrument: list[list[int]],
+        semitones_in_chord: list[int],
+        range_above_below: int = 2,
+        starting_string_idx: int = 0,
+) -> tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]:
+    """
+    NumPy version of build_chord_better. Candidate voicings for each fret range are built as a (candidates x strings)
+        fret array, with unplayed strings marked MUTED_FRET so that every string subset is covered by the same array,
+        and rules 1-3 are checked over all candidates at once.
+    :param semitones_in_instrument: Semitones from C for each fret of each string
+    :param semitones_in_chord: Semitones from C in the chord, bass note (usually the root) first
+    :param range_above_below: Half-width of the allowed fret range
+    :param starting_string_idx: Index of the string holding the root
+    :return: fretted voicings, barre voicings split by handle_barre_chord
+    """
+    if np is None:
+        raise ImportError("build_chord_vectorized requires numpy; use charting_better.build_chord_backtracking instead")
+
+    root_frets_in_fret_ranges, chord_frets_in_fret_ranges, chord_semitones_in_fret_ranges, num_strings = \
+        get_chord_fret_candidates(semitones_in_instrument, semitones_in_chord, range_above_below, starting_string_idx)
+    minimum_search_strings = len(semitones_in_chord) - 1
+    num_search_strings = num_strings - 1
+    search_strings: list[int] = [string + starting_string_idx + 1 for string in range(num_search_strings)]
+
+    chord_mask = get_semitones_mask(semitones_in_chord)
+
+    # voicings are kept by voicing key, so overlapping fret ranges deduplicate
+    validated_chord_string_fret_tuples: dict[int, list[tuple[int, int]]] = dict()
+    validated_barre_string_fret_tuples: dict[int, list[tuple[int, int]]] = dict()
+
+    for idx, root_fret in enumerate(root_frets_in_fret_ranges):
+        # each string is either muted or plays one of its chord frets
+        string_fret_options = [
+            np.array([MUTED_FRET] + frets, dtype=np.int16) for frets in chord_frets_in_fret_ranges[idx]]
+        # 12-bit pitch class masks of each option, so rule 1 is a bitwise or across strings
+        string_mask_options = [
+            np.array([0] + [1 << semitone for semitone in semitones], dtype=np.int16)
+            for semitones in chord_semitones_in_fret_ranges[idx]]
+        num_options = [len(options) for options in string_fret_options]
+        # mixed-radix strides; candidate n plays option (n // stride) % num_options on each string
+        strides = [1] * num_search_strings
+        for string in reversed(range(num_search_strings - 1)):
+            strides[string] = strides[string + 1] * num_options[string + 1]
+        num_candidates = strides[0] * num_options[0]
+
+        for block_start in range(0, num_candidates, CANDIDATES_PER_BLOCK):
+            candidate_idxs = np.arange(block_start, min(block_start + CANDIDATES_PER_BLOCK, num_candidates))
+            option_idxs = [(candidate_idxs // strides[string]) % num_options[string] for string in range(num_search_strings)]
+            fret_combinations = np.stack(
+                [string_fret_options[string][option_idxs[string]] for string in range(num_search_strings)], axis=1)
+            combination_masks = np.bitwise_or.reduce(
+                np.stack([string_mask_options[string][option_idxs[string]] for string in range(num_search_strings)], axis=1),
+                axis=1) | (1 << semitones_in_chord[0])
+
+            is_played = fret_combinations != MUTED_FRET
+            num_voicing_notes = np.count_nonzero(is_played, axis=1) + 1
+
+            # build_chord_better only forms string subsets with at least this many strings above the starting string
+            is_candidate = num_voicing_notes - 1 >= minimum_search_strings
+            # apply rule 1: each semitone in the chord must be represented in the combination
+            is_candidate &= combination_masks & chord_mask == chord_mask
+
+            # apply rule 3: barre chords have no open strings, consecutive strings and more than one note on the
+            # lowest fret, with no more than 3 notes off it
+            num_open_notes = np.count_nonzero(fret_combinations == 0, axis=1) + int(root_fret == 0)
+            is_consecutive = ~np.any(is_played[:, 1:] & ~is_played[:, :-1], axis=1)
+            min_frets = np.minimum(np.where(is_played, fret_combinations, root_fret).min(axis=1), root_fret)
+            num_barre_notes = (np.count_nonzero(fret_combinations == min_frets[:, None], axis=1)
+                               + (min_frets == root_fret))
+            is_barre = (num_open_notes == 0) & is_consecutive & (num_barre_notes > 1) & (
+                num_voicing_notes - num_barre_notes <= 3)
+
+            # otherwise, remove all entries with more than 4 fretted notes
+            is_fretted = ~is_barre & (num_voicing_notes - num_open_notes <= 4)
+
+            for validated_string_fret_tuples, is_valid in (
+                    (validated_barre_string_fret_tuples, is_candidate & is_barre),
+                    (validated_chord_string_fret_tuples, is_candidate & is_fretted),
+            ):
+                for frets, played in zip(fret_combinations[is_valid].tolist(), is_played[is_valid].tolist()):
+                    string_fret_tuples = [(starting_string_idx, root_fret)] + [
+                        (string, fret) for string, fret, is_played_string in zip(search_strings, frets, played)
+                        if is_played_string]
+                    validated_string_fret_tuples[encode_voicing(string_fret_tuples)] = string_fret_tuples
+
+    handled_validated_barre_string_fret_tuples: list[tuple[list[tuple[int, int]], list[tuple[int, int]]]] = [
+        handle_barre_chord(barre_chord)
+        for barre_chord in canonicalize_voicings(validated_barre_string_fret_tuples.values())
+    ]
+
+    return canonicalize_voicings(validated_chord_string_fret_tuples.values()), handled_validated_barre_string_fret_tuples
+
+
+if __name__ == '__main__':
+    pass
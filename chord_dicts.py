@@ -15,7 +15,7 @@ note_to_index: dict[str: int] = {
     'Ab': 8,
     'A': 9,
     'A#': 10,
-    'Bb': 11,
+    'Bb': 10,
     'B': 11,
     'Cb': 11,
     }
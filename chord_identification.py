@@ -0,0 +1,58 @@
+from typing import Iterable
+
+from charting import convert_chord_to_mask, get_semitones_mask
+from chord_dicts import chords_to_intervals, index_to_note
+
+
+def build_chord_identification_table() -> list[tuple[tuple[str, str], ...]]:
+    """
+    Gets every (root, chord type) for each of the 4096 sets of pitch classes, indexed by the 12-bit mask with bit n set
+        for n semitones from C
+    :return: (root, chord type) matches for each mask, by root from C and then in chord_dicts.chords_to_intervals order
+    """
+    table: list[list[tuple[str, str]]] = [list() for _ in range(1 << 12)]
+    for root_semitones in range(12):
+        chord_root = index_to_note.get(root_semitones)
+        for chord_type in chords_to_intervals.keys():
+            table[convert_chord_to_mask(chord_type, chord_root)].append((chord_root, chord_type))
+
+    return [tuple(chord_matches) for chord_matches in table]
+
+
+chord_identification_table: list[tuple[tuple[str, str], ...]] = build_chord_identification_table()
+
+
+def identify_chord(
+        string_fret_tuples: list[tuple[int, int]],
+        semitones_from_c: list[list[int]],
+) -> list[tuple[str, str]]:
+    """
+    Names the chord a voicing plays
+    :param string_fret_tuples: Played strings and their frets
+    :param semitones_from_c: Semitones from C for each fret of each string (see charting.get_instrument_semitones_from_c)
+    :return: (root, chord type) of every chord with exactly the voicing's notes, those rooted on the lowest played note
+        first
+    """
+    voicing_mask = get_semitones_mask(semitones_from_c[string][fret] for string, fret in string_fret_tuples)
+    chord_matches = chord_identification_table[voicing_mask]
+    if len(chord_matches) < 2:
+        return list(chord_matches)
+
+    bass_string, bass_fret = min(string_fret_tuples)
+    bass_note = index_to_note.get(semitones_from_c[bass_string][bass_fret])
+
+    return sorted(chord_matches, key=lambda chord_match: chord_match[0] != bass_note)
+
+
+def identify_chords(
+        voicings: Iterable[list[tuple[int, int]]],
+        semitones_from_c: list[list[int]],
+) -> list[list[tuple[str, str]]]:
+    """
+    identify_chord for each of many voicings on the same instrument
+    """
+    return [identify_chord(string_fret_tuples, semitones_from_c) for string_fret_tuples in voicings]
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,196 @@
+from itertools import accumulate
+from typing import Literal
+
+
+class FretboardLayout:
+    """
+    Positions of everything drawn on a fretboard, as plain data: shared by the Tk drawing code and renderers without a
+        display. Built by get_fretboard_layout; x runs from the nut along the neck, y from the first string down.
+    """
+
+    def __init__(
+            self,
+            width: float,
+            height: float,
+            neck_end_x_coord: float,
+            fret_x_coords: tuple[float, ...],
+            fret_x_coord_midpoints: tuple[float, ...],
+            string_x_coords: tuple[float, float],
+            string_y_coords: tuple[float, ...],
+            fret_y_coords: tuple[float, float],
+            single_marker_coords: tuple[tuple[float, float], ...],
+            double_marker_coords: tuple[tuple[float, float], ...],
+    ):
+        """
+        :param width: Width of the whole chart, fretboard and margins, px
+        :param height: Height of the whole chart, px
+        :param neck_end_x_coord: x-coord of the end of the neck
+        :param fret_x_coords: x-coord of the nut and of each fret before the end of the neck
+        :param fret_x_coord_midpoints: x-coord notes are marked at on each fret; the nut's for fret 0 (open strings)
+        :param string_x_coords: x-coords each string starts and ends at
+        :param string_y_coords: y-coord of each string, in tuning order
+        :param fret_y_coords: y-coords each fret starts and ends at
+        :param single_marker_coords: Centre of each single fret marker
+        :param double_marker_coords: Centres of the octave fret markers, two per octave
+        """
+        self.width = width
+        self.height = height
+        self.neck_end_x_coord = neck_end_x_coord
+        self.fret_x_coords = fret_x_coords
+        self.fret_x_coord_midpoints = fret_x_coord_midpoints
+        self.string_x_coords = string_x_coords
+        self.string_y_coords = string_y_coords
+        self.fret_y_coords = fret_y_coords
+        self.single_marker_coords = single_marker_coords
+        self.double_marker_coords = double_marker_coords
+
+
+# layouts by the arguments of get_fretboard_layout; layouts are never changed once built, so they are shared
+fretboard_layouts: dict[tuple, FretboardLayout] = dict()
+
+
+def get_fret_x_coords(
+        num_frets: int,
+        neck_length: float,
+        init_x: float,
+) -> tuple[list[float], list[float]]:
+    """
+    Spaces frets along the neck by the equal temperament ratio, each 2^(-1/12) as wide as the one before
+    :return: x-coord of the nut and each fret before the end of the neck, and x-coord notes are marked at on each fret
+    """
+    two_1_12_amen: float = 2**(-1/12)
+    relative_fret_x_values = [two_1_12_amen**n for n in range(num_frets)]
+    scale_constant = sum(relative_fret_x_values)
+    fret_x_diffs: list[float] = [
+        relative_scale * neck_length / scale_constant for relative_scale in relative_fret_x_values]
+
+    # cumsum for x positions; the nut is at 0
+    fret_x_values: list[float] = [0.] + list(accumulate(fret_x_diffs[:num_frets - 1]))
+
+    # notes on fret 0 (open strings) are marked on the nut, and on other frets between the fret and the one before it
+    fret_midpoints: list[float] = [init_x] + [
+        (fret_x_values[i] + fret_x_values[i - 1]) * 0.5 + init_x
+        for i in range(1, num_frets)
+    ]
+
+    return [fret_x_value + init_x for fret_x_value in fret_x_values], fret_midpoints
+
+
+def get_fret_marker_frets(num_frets: int) -> tuple[list[int], list[int]]:
+    """
+    :return: frets with single markers (3, 5, 7 and 9 of each octave), frets with double markers (octaves); only frets
+        before the end of the neck are included
+    """
+    single_frets_to_mark: list[int] = sorted(
+        fret
+        for octave_fret in range(0, num_frets, 12)
+        for fret in (octave_fret + 3, octave_fret + 5, octave_fret + 7, octave_fret + 9)
+        if fret < num_frets)
+    octave_fret_markers: list[int] = list(range(12, num_frets, 12))
+
+    return single_frets_to_mark, octave_fret_markers
+
+
+def get_fret_marker_y_coords(
+        string_y_coords: list[float],
+        single_marker_position: Literal["middle", "top", "bottom", "none"],
+        double_marker_position: Literal["middle", "top", "bottom", "none"],
+) -> tuple[list[float], list[float]]:
+    """
+    :return: y-coord of the single markers, y-coords of the two octave markers; empty for markers positioned "none"
+    """
+    num_strings = len(string_y_coords)
+    num_strings_is_odd: bool = num_strings % 2 == 1
+    middle_string: int = num_strings // 2
+
+    # set single marker y positions
+    if single_marker_position == "none":
+        single_marker_y_coords = list()
+    elif single_marker_position == "middle":
+        if num_strings_is_odd:
+            single_marker_y_coords = [(string_y_coords[middle_string] + string_y_coords[middle_string + 1]) * 0.5]
+        else:
+            single_marker_y_coords = [(string_y_coords[middle_string - 1] + string_y_coords[middle_string]) * 0.5]
+    elif single_marker_position == "top":
+        single_marker_y_coords = [(string_y_coords[0] + string_y_coords[1]) * 0.5]
+    else:
+        single_marker_y_coords = [(string_y_coords[-1] + string_y_coords[-2]) * 0.5]
+
+    # set octave marker y positions
+    if double_marker_position == "none":
+        double_marker_y_coords = list()
+    elif double_marker_position == "middle":
+        # if odd number of strings, doubled markers should be split between the middle string
+        if num_strings_is_odd:
+            double_marker_y_coords = [(string_y_coords[middle_string - 1] + string_y_coords[middle_string]) * 0.5,
+                                      (string_y_coords[middle_string] + string_y_coords[middle_string + 1]) * 0.5]
+        # if even number of strings, doubled markers should be split between the strings above and below middle strings
+        else:
+            double_marker_y_coords = [(string_y_coords[middle_string - 2] + string_y_coords[middle_string - 1]) * 0.5,
+                                      (string_y_coords[middle_string] + string_y_coords[middle_string + 1]) * 0.5]
+    elif double_marker_position == "top":
+        double_marker_y_coords = [(string_y_coords[0] + string_y_coords[1]) * 0.5,
+                                  (string_y_coords[1] + string_y_coords[2]) * 0.5]
+    else:
+        double_marker_y_coords = [(string_y_coords[-1] + string_y_coords[-2]) * 0.5,
+                                  (string_y_coords[-2] + string_y_coords[-3]) * 0.5]
+
+    return single_marker_y_coords, double_marker_y_coords
+
+
+def get_fretboard_layout(
+        num_frets: int,
+        num_strings: int,
+        neck_scale_constant: float = 300,
+        string_spacing: float = 11,
+        init_x_coord: float = 40,
+        init_y_coord: float = 40,
+        padding: float = 20.0,
+        single_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
+        double_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
+) -> FretboardLayout:
+    """
+    Lays out a fretboard, once per set of arguments (see fretboard_layouts). Parameters are those of
+        graphics_tk.make_fretboard.
+    """
+    layout_key = (num_frets, num_strings, neck_scale_constant, string_spacing, init_x_coord, init_y_coord, padding,
+                  single_marker_pos, double_marker_pos)
+    layout = fretboard_layouts.get(layout_key)
+    if layout is not None:
+        return layout
+
+    fretboard_width = string_spacing * (num_strings - 1)
+    fret_x_coords, fret_x_coord_midpoints = get_fret_x_coords(num_frets, neck_scale_constant, init_x_coord)
+    string_y_coords: list[float] = [init_y_coord + i * string_spacing for i in range(num_strings)]
+
+    single_frets_to_mark, octave_fret_markers = get_fret_marker_frets(num_frets)
+    single_marker_y_coords, double_marker_y_coords = get_fret_marker_y_coords(
+        string_y_coords, single_marker_pos, double_marker_pos)
+
+    # boundaries: (-init_x, fretboard_length + init_x)
+    #             (-init_y, string_width + init_y)
+    # => width = 2 * init_x + fretboard_length + padding
+    # => length = 2 * init_y + fretboard_width + padding
+    layout = FretboardLayout(
+        width=neck_scale_constant + 2 * abs(init_x_coord) + padding,
+        height=fretboard_width * 1.2 + abs(init_y_coord) + padding,
+        neck_end_x_coord=init_x_coord + neck_scale_constant,
+        fret_x_coords=tuple(fret_x_coords),
+        fret_x_coord_midpoints=tuple(fret_x_coord_midpoints),
+        string_x_coords=(init_x_coord, init_x_coord + neck_scale_constant),
+        string_y_coords=tuple(string_y_coords),
+        fret_y_coords=(init_y_coord, init_y_coord + fretboard_width),
+        single_marker_coords=tuple(
+            (fret_x_coord_midpoints[fret], y_coord)
+            for fret in single_frets_to_mark for y_coord in single_marker_y_coords),
+        double_marker_coords=tuple(
+            (fret_x_coord_midpoints[fret], y_coord)
+            for fret in octave_fret_markers for y_coord in double_marker_y_coords),
+    )
+    fretboard_layouts.update({layout_key: layout})
+
+    return layout
+
+
+if __name__ == '__main__':
+    pass
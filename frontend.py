@@ -8,8 +8,17 @@ from typing import Literal
 
 from chord_dicts import note_to_index, chords_to_intervals, intervals_in_scales
 from style_dicts import hex_style_dict, instrument_presets
-from instruments import Instrument
+from instruments import Instrument, get_instrument
 from math import ceil
+from queue import Queue, Empty
+from threading import Event, Thread
+from time import monotonic
+
+
+# ms between checks of the chord search queue
+SEARCH_POLL_MS = 50
+# most chord charts drawn per check of the chord search queue
+CHARTS_PER_POLL = 3
 
 
 # still todo
@@ -47,12 +56,14 @@ class InstrumentPreviewImage:
         self.num_frets = num_frets
         self.tuning = tuning
         self.instrument_preview_frame = instrument_preview_frame
-        self.curr_instrument = Instrument(
+        self.curr_instrument = get_instrument(
             num_frets,
             tuning,
+            self.style,
             instrument_preview_frame,
-            style=self.style,
         )
+        # the preview has its own copy of the fretboard, since the instrument is shared with every screen
+        self.preview_canvas = self.curr_instrument.make_chart_canvas(self.instrument_preview_frame)
 
     def update(
             self,
@@ -60,18 +71,19 @@ class InstrumentPreviewImage:
             num_frets: int,
             tuning: str,
     ):
-        # ungrid last canvas preview, update parameters, grid
-        self.curr_instrument.template_canvas.grid_forget()
+        # remove last canvas preview, update parameters, grid
+        self.preview_canvas.destroy()
         self.style = style
         self.num_frets = num_frets
         self.tuning = tuning
-        self.curr_instrument = Instrument(
+        self.curr_instrument = get_instrument(
             self.num_frets,
             self.tuning,
+            self.style,
             self.instrument_preview_frame,
-            style=self.style,
         )
-        self.curr_instrument.template_canvas.grid(row=2, column=0, columnspan=2)
+        self.preview_canvas = self.curr_instrument.make_chart_canvas(self.instrument_preview_frame)
+        self.preview_canvas.grid(row=2, column=0, columnspan=2)
 
 
 class EveryChord:
@@ -89,6 +101,8 @@ class EveryChord:
             default_arp_root: str = "C",
             default_arp_type: str = "M7",
             default_pagination: int = 3,
+            default_top_k: int | None = None,
+            default_search_seconds: float | None = 10.,
     ):
         # project assets
         self.master = Tk()
@@ -121,7 +135,8 @@ class EveryChord:
         self.instrument_preview_window_frame = Frame(master=self.master)
         self.chart_type_selection_frame = Frame(master=self.master)
         self.chord_selection_frame = Frame(master=self.master)
-        # because chords are paginated, we have to initialize a container for pages
+        # because chords are paginated, we have to initialize a container for pages; the chord viewer keeps two, the
+        # visible page and the next one, and redraws them as the user pages through
         self.pages: list[Frame] = list()
         self.fretboard_storage_frame = Frame(master=self.master)
         self.scale_selection_frame = Frame(master=self.master)
@@ -160,6 +175,10 @@ class EveryChord:
         self.arp_type_var = StringVar()
         self.arp_type_var.set(default_arp_type)
         self.default_pagination = default_pagination
+        # if set, the chord viewer only shows this many of the most playable voicings
+        self.default_top_k = default_top_k
+        # chord searches stop after this many seconds and show the voicings found so far; None to never stop early
+        self.default_search_seconds = default_search_seconds
         self.previous_frame = self.instrument_preset_frame
 
         self.main_menu = MainMenu(self)
@@ -683,9 +702,8 @@ class ChordSelection:
 
     def next(self):
         self.app.chord_selection_frame.grid_forget()
-        self.app.chord_viewer = ChordViewer(self.app)
+        # the same viewer is kept, so that its chart canvases are reused
         self.app.chord_viewer.update_chord()
-        self.app.pages[0].grid(column=1)
         return
 
     def back(self):
@@ -698,23 +716,48 @@ class ChordViewer:
     def __init__(self, app: EveryChord):
 
         self.app = app
-        self.num_chords_to_display = 0
+        # every voicing received so far, as (chord, is_barre); pages are ranges of default_pagination of them
+        self.chords: list = list()
         self.curr_page_idx = 0
-        self.num_pages = 0
+        self.num_pages = 1
+        # two page frames (see self.app.pages), one visible and one holding the next page, drawn in idle time. Each
+        # keeps a canvas per chart slot with the fretboard drawn on it, so changing page only redraws the voicings
+        self.pool_instrument: Instrument | None = None
+        self.page_charts: list[list[Canvas]] = list()
+        self.page_labels: list[Label] = list()
+        self.visible_pool_idx = 0
+        # page index each page frame holds, and how many of its charts are drawn
+        self.pool_page_idxs: list[int | None] = [None, None]
+        self.page_num_charts: list[int] = [0, 0]
+        # set to cancel the running chord search, once a different chord is picked
+        self.search_cancel_event: Event | None = None
+        # queue the running chord search puts its voicings on; see Instrument.stream_chord_fret_pairs
+        self.search_queue: Queue | None = None
+        self.search_is_done = True
+        self.search_is_partial = False
+        self.title: str = ""
 
         return
 
-    def paginate(self) -> list[Frame]:
+    def cancel_search(self):
+        if self.search_cancel_event is not None:
+            self.search_cancel_event.set()
+            self.search_cancel_event = None
+        # polling stops once its queue is no longer the current one
+        self.search_queue = None
 
-        self.num_pages = ceil(self.num_chords_to_display / self.app.default_pagination)
-        pages: list[Frame] = list()
-        bg_color: str = self.app.instrument_preview.curr_instrument.background_color
+    def make_page_pool(self):
 
-        for i in range(self.num_pages):
+        for page in self.app.pages:
+            page.destroy()
+        self.app.pages = list()
+        self.page_charts = list()
+        self.page_labels = list()
 
+        for _ in range(2):
             this_page = Frame(
                 self.app.master,
-                bg=bg_color,
+                bg=self.app.instrument.background_color,
             )
             split_columns_evenly(this_page, 3)
 
@@ -734,74 +777,182 @@ class ChordViewer:
                 width=round(self.app.button_width / 2),
             )
 
-            prev_page_button.grid(row=1, column=0, sticky="E")
-            next_page_button.grid(row=1, column=2, sticky="W")
-
-            pages.append(this_page)
-
-        return pages
-
-    def update_chord(self):
-
-        # we need to reinitialize the instrument with the current frame to display voicings
-        self.app.instrument = Instrument(
-            num_frets=self.app.instrument_preview.curr_instrument.num_frets,
-            tuning=self.app.instrument_preview.curr_instrument.tuning,
-            style=self.app.instrument_preview.curr_instrument.style,
-            display_frame=self.app.fretboard_storage_frame
-        )
-
-        # now compute chords and show
-        title: str = self.app.chord_root_var.get() + self.app.chord_type_var.get()
-        fretted_chords, barred_chords = self.app.instrument.get_chord_fret_pairs(
-            self.app.chord_root_var.get(),
-            self.app.chord_type_var.get())
-        self.num_chords_to_display = len(fretted_chords) + len(barred_chords)
-
-        # initializes pages
-        self.app.pages = self.paginate()
-        # populates pages
-        self.app.instrument.display_chord_voicings(
-            fretted_chords, barred_chords,
-            title, self.app.pages, self.app.default_pagination)
-
-        for page_idx, page in enumerate(self.app.pages):
-            # we need to do this after instantiating instrument
-            page.config(bg=self.app.instrument.background_color)
-
             current_page_label = Label(
-                text=f"{page_idx + 1} / {self.num_pages}",
                 font=self.app.project_font,
-                master=page,
+                master=this_page,
             )
 
             back_button = Button(
-                master=page,
+                master=this_page,
                 text="Back",
                 font=self.app.project_font,
                 command=lambda: self.back(),
                 width=self.app.button_width,
             )
 
+            prev_page_button.grid(row=1, column=0, sticky="E")
+            next_page_button.grid(row=1, column=2, sticky="W")
             current_page_label.grid(row=1, column=1)
             back_button.grid(row=0, column=0, columnspan=3)
 
-        self.app.pages[self.curr_page_idx].grid()
+            self.app.pages.append(this_page)
+            self.page_labels.append(current_page_label)
+            self.page_charts.append([
+                self.app.instrument.make_chart_canvas(this_page) for _ in range(self.app.default_pagination)])
+
+        self.pool_instrument = self.app.instrument
+        self.pool_page_idxs = [None, None]
+        self.page_num_charts = [0, 0]
+        return
+
+    def assign_page(self, pool_idx: int, page_idx: int):
+        """
+        Sets the page a page frame holds, hiding its charts until fill_page draws them
+        """
+        self.pool_page_idxs[pool_idx] = page_idx
+        self.page_num_charts[pool_idx] = 0
+        for chord_chart in self.page_charts[pool_idx]:
+            chord_chart.grid_remove()
+
+    def fill_page(self, pool_idx: int, max_charts: int | None = None) -> int:
+        """
+        Draws the charts of a page frame's page which have arrived but are not drawn yet
+        :param max_charts: Most charts to draw. Default None (all of them).
+        :return: number of charts drawn
+        """
+        page_start_idx = self.pool_page_idxs[pool_idx] * self.app.default_pagination
+        first_chord_idx = page_start_idx + self.page_num_charts[pool_idx]
+        last_chord_idx = min(page_start_idx + self.app.default_pagination, len(self.chords))
+        if max_charts is not None:
+            last_chord_idx = min(last_chord_idx, first_chord_idx + max_charts)
+
+        for chord_idx in range(first_chord_idx, last_chord_idx):
+            chord, is_barre = self.chords[chord_idx]
+            chord_chart = self.page_charts[pool_idx][chord_idx - page_start_idx]
+            self.app.instrument.draw_chord_voicing(chord_chart, chord, is_barre, self.title)
+            # put canvases below all menu items
+            chord_chart.grid(row=2 + chord_idx - page_start_idx, column=0, columnspan=3)
+
+        num_charts = max(last_chord_idx - first_chord_idx, 0)
+        self.page_num_charts[pool_idx] += num_charts
+        return num_charts
+
+    def page_is_filled(self, pool_idx: int) -> bool:
+        page_idx = self.pool_page_idxs[pool_idx]
+        page_end_idx = min((page_idx + 1) * self.app.default_pagination, len(self.chords))
+        return page_idx * self.app.default_pagination + self.page_num_charts[pool_idx] >= page_end_idx
+
+    def show_page(self):
+
+        other_pool_idx = 1 - self.visible_pool_idx
+        if self.pool_page_idxs[other_pool_idx] == self.curr_page_idx:
+            # the page was drawn ahead of time
+            self.app.pages[self.visible_pool_idx].grid_forget()
+            self.visible_pool_idx = other_pool_idx
+        elif self.pool_page_idxs[self.visible_pool_idx] != self.curr_page_idx:
+            self.assign_page(self.visible_pool_idx, self.curr_page_idx)
+            self.fill_page(self.visible_pool_idx)
+        self.update_page_labels()
+        self.app.pages[self.visible_pool_idx].grid(column=1)
+
+        self.app.master.after_idle(self.prefetch_page, (self.curr_page_idx + 1) % self.num_pages)
+        return
+
+    def prefetch_page(self, page_idx: int):
+
+        # skip pages which are no longer next, or have no voicings yet; polling prefetches those once they arrive
+        other_pool_idx = 1 - self.visible_pool_idx
+        if (page_idx in self.pool_page_idxs or page_idx != (self.curr_page_idx + 1) % self.num_pages
+                or page_idx * self.app.default_pagination >= len(self.chords)):
+            return
+
+        self.assign_page(other_pool_idx, page_idx)
+        self.fill_page(other_pool_idx)
+        self.update_page_labels()
+        return
+
+    def update_page_labels(self):
+
+        status = " (searching)" if not self.search_is_done else " (partial)" if self.search_is_partial else ""
+        for page_idx, current_page_label in zip(self.pool_page_idxs, self.page_labels):
+            if page_idx is not None:
+                current_page_label.config(text=f"{page_idx + 1} / {self.num_pages}{status}")
+
+    def update_chord(self):
+
+        # the instrument is shared with the preview and the other screens; see instruments.get_instrument
+        self.app.instrument = get_instrument(
+            self.app.instrument_preview.curr_instrument.num_frets,
+            self.app.instrument_preview.curr_instrument.tuning,
+            self.app.instrument_preview.curr_instrument.style,
+            self.app.fretboard_storage_frame,
+        )
+
+        # a search still running for the previous chord is stale
+        self.cancel_search()
+        if self.app.instrument is not self.pool_instrument:
+            self.make_page_pool()
+        self.pool_page_idxs = [None, None]
+        self.chords = list()
+        self.curr_page_idx = 0
+        self.num_pages = 1
+        self.search_is_done = False
+        self.search_is_partial = False
+        self.title = self.app.chord_root_var.get() + self.app.chord_type_var.get()
+
+        # search on a worker thread, so that the window stays responsive; voicings are drawn as they arrive
+        self.search_cancel_event = Event()
+        self.search_queue = Queue()
+        deadline = None if self.app.default_search_seconds is None else monotonic() + self.app.default_search_seconds
+        Thread(
+            target=self.app.instrument.stream_chord_fret_pairs,
+            args=(self.app.chord_root_var.get(), self.app.chord_type_var.get(), self.search_queue),
+            kwargs={'deadline': deadline, 'cancel_event': self.search_cancel_event, 'top_k': self.app.default_top_k},
+            daemon=True,
+        ).start()
+
+        # the first page is shown at once and filled in as voicings arrive
+        self.show_page()
+        self.app.master.after(SEARCH_POLL_MS, self.poll_search, self.search_queue)
+        return
+
+    def poll_search(self, search_queue: Queue):
+
+        if search_queue is not self.search_queue:
+            return
+
+        while not self.search_is_done:
+            try:
+                chords, self.search_is_done, self.search_is_partial = search_queue.get_nowait()
+            except Empty:
+                break
+            self.chords.extend(chords)
+        self.num_pages = max(ceil(len(self.chords) / self.app.default_pagination), 1)
+
+        # only draw a few charts at a time, so that the window is not held up by many voicings arriving at once; the
+        # visible page goes first
+        num_charts_left = CHARTS_PER_POLL
+        drawn_pool_idxs = [
+            pool_idx for pool_idx in (self.visible_pool_idx, 1 - self.visible_pool_idx)
+            if self.pool_page_idxs[pool_idx] is not None]
+        for pool_idx in drawn_pool_idxs:
+            num_charts_left -= self.fill_page(pool_idx, num_charts_left)
+        next_page_idx = (self.curr_page_idx + 1) % self.num_pages
+        if next_page_idx not in self.pool_page_idxs:
+            self.app.master.after_idle(self.prefetch_page, next_page_idx)
+        self.update_page_labels()
+
+        if not self.search_is_done or not all(map(self.page_is_filled, drawn_pool_idxs)):
+            self.app.master.after(SEARCH_POLL_MS, self.poll_search, search_queue)
         return
 
     def goto_next_page(self):
-        curr_page = self.app.pages[self.curr_page_idx]
-        curr_page.grid_forget()
         self.increment_page_idx("next")
-        next_page = self.app.pages[self.curr_page_idx]
-        next_page.grid()
+        self.show_page()
 
     def goto_last_page(self):
-        curr_page = self.app.pages[self.curr_page_idx]
-        curr_page.grid_forget()
         self.increment_page_idx("prev")
-        last_page = self.app.pages[self.curr_page_idx]
-        last_page.grid()
+        self.show_page()
 
     def increment_page_idx(self, mode: Literal["next","prev"]):
 
@@ -811,7 +962,8 @@ class ChordViewer:
             self.curr_page_idx = (self.curr_page_idx - 1) % self.num_pages
 
     def back(self):
-        self.app.pages[self.curr_page_idx].grid_forget()
+        self.cancel_search()
+        self.app.pages[self.visible_pool_idx].grid_forget()
         self.app.chord_selection_frame.grid(column=1)
         return
 
@@ -909,19 +1061,20 @@ class ScaleViewer:
     def update_scale(self):
         # clear last chart
         self.scale_canvas.pack_forget()
-        # update parameters to current user input values
-        self.app.instrument = Instrument(
-            num_frets=self.app.instrument_preview.curr_instrument.num_frets,
-            tuning=self.app.instrument_preview.curr_instrument.tuning,
-            style=self.app.instrument_preview.curr_instrument.style,
-            display_frame=self.app.scale_viewer_frame
+        # update parameters to current user input values; the instrument is shared with the other screens
+        self.app.instrument = get_instrument(
+            self.app.instrument_preview.curr_instrument.num_frets,
+            self.app.instrument_preview.curr_instrument.tuning,
+            self.app.instrument_preview.curr_instrument.style,
+            self.app.scale_viewer_frame,
         )
 
         self.fretted_notes = self.app.instrument.get_scale(
             self.app.scale_root_var.get(),
             self.app.scale_type_var.get())
         self.title = self.app.scale_root_var.get() + " " + self.app.scale_type_var.get() + " scale"
-        self.scale_canvas = self.app.instrument.display_voicing(self.fretted_notes, self.title)
+        self.scale_canvas = self.app.instrument.display_voicing(
+            self.fretted_notes, self.title, master=self.app.scale_viewer_frame)
         # display the new canvas
         self.scale_canvas.pack()
         return
@@ -1026,19 +1179,20 @@ class ArpeggioViewer:
     def update_arpeggio(self):
         # clear last chart
         self.arp_canvas.pack_forget()
-        # update parameters to current user input values
-        self.app.instrument = Instrument(
-            num_frets=self.app.instrument_preview.curr_instrument.num_frets,
-            tuning=self.app.instrument_preview.curr_instrument.tuning,
-            style=self.app.instrument_preview.curr_instrument.style,
-            display_frame=self.app.arpeggio_viewer_frame
+        # update parameters to current user input values; the instrument is shared with the other screens
+        self.app.instrument = get_instrument(
+            self.app.instrument_preview.curr_instrument.num_frets,
+            self.app.instrument_preview.curr_instrument.tuning,
+            self.app.instrument_preview.curr_instrument.style,
+            self.app.arpeggio_viewer_frame,
         )
 
         self.fretted_notes = self.app.instrument.get_arp(
             self.app.arp_root_var.get(),
             self.app.arp_type_var.get())
         self.title = self.app.arp_root_var.get() + self.app.arp_type_var.get() + " arpeggio"
-        self.arp_canvas = self.app.instrument.display_voicing(self.fretted_notes, self.title)
+        self.arp_canvas = self.app.instrument.display_voicing(
+            self.fretted_notes, self.title, master=self.app.arpeggio_viewer_frame)
         # display the new canvas
         self.arp_canvas.pack()
 
@@ -0,0 +1,316 @@
+import argparse
+from math import ceil
+from typing import Literal
+from xml.sax.saxutils import escape, quoteattr
+
+from charting import (get_instrument_semitones_from_c, convert_chord_to_semitones, convert_slash_chord_to_semitones,
+                      convert_scale_to_semitones, build_scale, build_arpeggio)
+from charting_better import iter_instrument_chord_voicings, handle_barre_chord
+from graphics_tk import DisplayList, compile_fretboard, draw_chord_chart, draw_notes_chart
+from style_dicts import hex_style_dict, hex_colors
+from voicing_scoring import select_top_voicings
+
+
+# Tk's default fill and outline of each item type; "" draws nothing
+tk_default_colors = {'line': ("black", ""),
+                     'rectangle': ("", "black"),
+                     'oval': ("", "black"),
+                     'arc': ("", "black"),
+                     'polygon': ("black", ""),
+                     'text': ("black", ""),
+                     }
+# SVG text-anchor and dominant-baseline of each Tk text anchor
+svg_text_anchors = {'center': ("middle", "central"),
+                    'n': ("middle", "text-before-edge"),
+                    'ne': ("end", "text-before-edge"),
+                    'e': ("end", "central"),
+                    'se': ("end", "text-after-edge"),
+                    's': ("middle", "text-after-edge"),
+                    'sw': ("start", "text-after-edge"),
+                    'w': ("start", "central"),
+                    'nw': ("start", "text-before-edge"),
+                    }
+
+
+def format_svg_number(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def get_svg_color(color: str) -> str:
+    return color if color else "none"
+
+
+def get_svg_element(
+        item_type: str,
+        coords: tuple[float, ...],
+        options: dict[str, any],
+) -> str:
+    """
+    Gets the SVG element drawing one Tk canvas item, as recorded by graphics_tk.DisplayList
+    """
+    default_fill, default_outline = tk_default_colors.get(item_type)
+    fill = get_svg_color(options.get("fill", default_fill))
+    tags = options.get("tags")
+    class_attribute = f' class={quoteattr(tags if type(tags) is str else " ".join(tags))}' if tags else ""
+    points = " ".join(format_svg_number(coord) for coord in coords)
+
+    if item_type == "text":
+        x_coord, y_coord = coords
+        font_family, font_size, *font_style = options.get("font", ("TkDefaultFont", 10))
+        text_anchor, dominant_baseline = svg_text_anchors.get(str(options.get("anchor", "center")))
+        font_weight = f' font-weight="{font_style[0]}"' if font_style and font_style[0] != "normal" else ""
+        return (f'<text x="{format_svg_number(x_coord)}" y="{format_svg_number(y_coord)}" fill="{fill}" '
+                f'font-family={quoteattr(font_family)} font-size="{font_size}pt"{font_weight} '
+                f'text-anchor="{text_anchor}" dominant-baseline="{dominant_baseline}"{class_attribute}>'
+                f'{escape(str(options.get("text", "")))}</text>')
+
+    if item_type == "line":
+        return f'<polyline points="{points}" fill="none" stroke="{fill}"{class_attribute}/>'
+
+    stroke = get_svg_color(options.get("outline", default_outline))
+    if item_type == "polygon":
+        return f'<polygon points="{points}" fill="{fill}" stroke="{stroke}"{class_attribute}/>'
+
+    x_lo, y_lo, x_hi, y_hi = coords
+    if item_type == "rectangle":
+        return (f'<rect x="{format_svg_number(min(x_lo, x_hi))}" y="{format_svg_number(min(y_lo, y_hi))}" '
+                f'width="{format_svg_number(abs(x_hi - x_lo))}" height="{format_svg_number(abs(y_hi - y_lo))}" '
+                f'fill="{fill}" stroke="{stroke}"{class_attribute}/>')
+
+    # ovals, and arcs, which are only drawn whole (see graphics_tk.canvas_debug_grid)
+    return (f'<ellipse cx="{format_svg_number((x_lo + x_hi) * 0.5)}" cy="{format_svg_number((y_lo + y_hi) * 0.5)}" '
+            f'rx="{format_svg_number(abs(x_hi - x_lo) * 0.5)}" ry="{format_svg_number(abs(y_hi - y_lo) * 0.5)}" '
+            f'fill="{fill}" stroke="{stroke}"{class_attribute}/>')
+
+
+class SvgChartSheet:
+    """
+    Sheet of charts on one instrument, drawn without Tk or a display and written as a single SVG document. The
+        fretboard is written once, as a <symbol>, and placed under every chart with <use>.
+    """
+
+    def __init__(
+            self,
+            num_frets: int,
+            tuning: str,
+            style: str = 'Dark mode',
+            charts_per_row: int = 2,
+            neck_scale_constant: float = 700,
+            string_spacing: float = 25,
+            init_x_coord: float = 100.0,
+            init_y_coord: float = 100.0,
+            padding: float = 50.0,
+            single_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
+            double_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
+            right_handed: bool = True,
+    ):
+        """
+        :param num_frets: Number of frets on instrument
+        :param tuning: Instrument tuning, as hyphen-separated notes, ex. "E-A-D-G-B-E"
+        :param style: Color scheme, from style_dicts.hex_style_dict
+        :param charts_per_row: Number of charts side by side
+        Other parameters are those of instruments.Instrument, with the same defaults.
+        """
+        self.num_frets = num_frets
+        self.tuning = tuning
+        self.semitones_from_c: list[list[int]] = get_instrument_semitones_from_c(
+            self.num_frets,
+            self.tuning.split("-"),
+        )
+        self.charts_per_row = charts_per_row
+
+        color_keys = hex_style_dict.get(style)
+        self.fretboard_color, self.background_color, self.fret_marker_color, self.note_marker_color, self.label_color = \
+            [hex_colors.get(color) for color in color_keys]
+        self.fret_x_coord_midpoints, self.string_y_coords, self.fretboard_display_list = compile_fretboard(
+            self.num_frets,
+            self.tuning,
+            fretboard_color=self.fretboard_color,
+            background_color=self.background_color,
+            marker_color=self.fret_marker_color,
+            label_color=self.label_color,
+            neck_scale_constant=neck_scale_constant,
+            string_spacing=string_spacing,
+            init_x_coord=init_x_coord,
+            init_y_coord=init_y_coord,
+            padding=padding,
+            single_marker_pos=single_marker_pos,
+            double_marker_pos=double_marker_pos,
+            right_handed=right_handed,
+        )
+
+        # set title location to top left
+        self.title_location: tuple[float, float] = self.fret_x_coord_midpoints[0], self.string_y_coords[0]
+        if right_handed:
+            self.string_y_coords.reverse()
+
+        # items drawn over the fretboard on each chart
+        self.charts: list[DisplayList] = list()
+
+    def add_chart(self) -> DisplayList:
+        chart = DisplayList(
+            self.fretboard_display_list.width,
+            self.fretboard_display_list.height,
+            self.background_color,
+        )
+        self.charts.append(chart)
+        return chart
+
+    def add_chord_voicing(
+            self,
+            string_fret_tuples: list[tuple[int, int]],
+            is_barre: bool,
+            title: str,
+    ) -> None:
+        """
+        Adds a chart of a (string_fret_tuples, is_barre) voicing, as found by the chord engines
+        """
+        chord = handle_barre_chord(string_fret_tuples) if is_barre else string_fret_tuples
+        draw_chord_chart(
+            self.add_chart(),
+            chord,
+            is_barre,
+            title,
+            self.fret_x_coord_midpoints,
+            self.string_y_coords,
+            self.title_location,
+            self.note_marker_color,
+            self.label_color,
+        )
+
+    def add_notes(
+            self,
+            fret_string_pairs: list[list[int, int]],
+            title: str,
+    ) -> None:
+        """
+        Adds a chart of a scale or arpeggio, from charting.build_scale or charting.build_arpeggio
+        """
+        draw_notes_chart(
+            self.add_chart(),
+            fret_string_pairs,
+            title,
+            self.fret_x_coord_midpoints,
+            self.string_y_coords,
+            self.title_location,
+            self.note_marker_color,
+            self.label_color,
+        )
+
+    def to_svg(self) -> str:
+        chart_width, chart_height = self.fretboard_display_list.width, self.fretboard_display_list.height
+        num_columns = min(self.charts_per_row, len(self.charts))
+        num_rows = ceil(len(self.charts) / self.charts_per_row)
+        sheet_width = format_svg_number(num_columns * chart_width)
+        sheet_height = format_svg_number(num_rows * chart_height)
+
+        svg_lines: list[str] = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            f'width="{sheet_width}" height="{sheet_height}" viewBox="0 0 {sheet_width} {sheet_height}">',
+            f'<symbol id="fretboard" width="{format_svg_number(chart_width)}" '
+            f'height="{format_svg_number(chart_height)}" overflow="visible">',
+            *(get_svg_element(*item) for item in self.fretboard_display_list.items),
+            '</symbol>',
+            f'<rect width="100%" height="100%" fill="{get_svg_color(self.background_color)}"/>',
+        ]
+        for chart_idx, chart in enumerate(self.charts):
+            row, column = divmod(chart_idx, self.charts_per_row)
+            svg_lines.append(f'<g transform="translate({format_svg_number(column * chart_width)} '
+                             f'{format_svg_number(row * chart_height)})">')
+            # both href forms, for renderers predating SVG 2
+            svg_lines.append('<use href="#fretboard" xlink:href="#fretboard"/>')
+            svg_lines.extend(get_svg_element(*item) for item in chart.items)
+            svg_lines.append('</g>')
+        svg_lines.append('</svg>')
+
+        return "\n".join(svg_lines) + "\n"
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as svg_file:
+            svg_file.write(self.to_svg())
+
+
+def export_chord_svg(
+        path: str,
+        num_frets: int,
+        tuning: str,
+        chord_root: str,
+        chord_type: str,
+        style: str = 'Dark mode',
+        top_k: int | None = None,
+        bass_note: str | None = None,
+        charts_per_row: int = 2,
+) -> int:
+    """
+    Writes a chart of every voicing of a chord to an SVG file, in canonical order
+    :param top_k: Keep only the top_k most playable voicings, easiest first. Default None (keep every voicing).
+    :param bass_note: Lowest note of every voicing (see charting.convert_slash_chord_to_semitones). Default None (the
+        root).
+    :return: number of voicings written
+    """
+    sheet = SvgChartSheet(num_frets, tuning, style, charts_per_row)
+    if bass_note is None:
+        intervals_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+    else:
+        intervals_in_chord = convert_slash_chord_to_semitones(chord_type, chord_root, bass_note)
+    voicings = iter_instrument_chord_voicings(sheet.semitones_from_c, intervals_in_chord)
+    if top_k is not None:
+        voicings = select_top_voicings(voicings, top_k)
+
+    title = chord_root + chord_type + ("" if bass_note is None else f"/{bass_note}")
+    for string_fret_tuples, is_barre in voicings:
+        sheet.add_chord_voicing(string_fret_tuples, is_barre, title)
+    sheet.save(path)
+
+    return len(sheet.charts)
+
+
+def export_scale_svg(
+        path: str,
+        num_frets: int,
+        tuning: str,
+        scale_root: str,
+        scale_type: str,
+        style: str = 'Dark mode',
+) -> None:
+    sheet = SvgChartSheet(num_frets, tuning, style, charts_per_row=1)
+    fret_string_pairs = build_scale(convert_scale_to_semitones(scale_type, scale_root), sheet.semitones_from_c)
+    sheet.add_notes(fret_string_pairs, scale_root + " " + scale_type + " scale")
+    sheet.save(path)
+
+
+def export_arpeggio_svg(
+        path: str,
+        num_frets: int,
+        tuning: str,
+        arp_root: str,
+        arp_type: str,
+        style: str = 'Dark mode',
+) -> None:
+    sheet = SvgChartSheet(num_frets, tuning, style, charts_per_row=1)
+    fret_string_pairs = build_arpeggio(sheet.semitones_from_c, convert_chord_to_semitones(arp_type, arp_root))
+    sheet.add_notes(fret_string_pairs, arp_root + arp_type + " arpeggio")
+    sheet.save(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Writes chord voicing, scale or arpeggio charts to an SVG file.")
+    parser.add_argument("chart", choices=["chord", "scale", "arpeggio"])
+    parser.add_argument("root", help="root note, ex. C#")
+    parser.add_argument("type", help="chord, scale or arpeggio type, ex. ' major' (see chord_dicts)")
+    parser.add_argument("--tuning", default="E-A-D-G-B-E")
+    parser.add_argument("--frets", type=int, default=22)
+    parser.add_argument("--style", default="Dark mode", choices=list(hex_style_dict.keys()))
+    parser.add_argument("--top-k", type=int, help="only chart the most playable chord voicings")
+    parser.add_argument("--bass-note", help="lowest note of every chord voicing")
+    parser.add_argument("--output", default="chart.svg", help="where to save the SVG file")
+    args = parser.parse_args()
+
+    if args.chart == "chord":
+        num_voicings = export_chord_svg(args.output, args.frets, args.tuning, args.root, args.type, args.style,
+                                        args.top_k, args.bass_note)
+        print(f"{num_voicings} voicings written to {args.output}")
+    elif args.chart == "scale":
+        export_scale_svg(args.output, args.frets, args.tuning, args.root, args.type, args.style)
+    else:
+        export_arpeggio_svg(args.output, args.frets, args.tuning, args.root, args.type, args.style)
@@ -1,13 +1,90 @@
 from tkinter import font, Canvas, Frame
 from tkinter import SW, RIGHT
 from typing import Literal
+from collections import OrderedDict
+from fretboard_layout import FretboardLayout, get_fretboard_layout
 
 
 MARKER_RADIUS = 8
+# fonts of the tuning labels, chart titles and nut annotations; font descriptions rather than font.Font objects, so that
+# charts can be drawn without Tk
+TUNING_FONT = ('Quicksand', 12)
+TITLE_FONT = ('Quicksand', 24)
+ANNOTATION_FONT = ('Quicksand', 12)
+
+
+class DisplayList:
+    """
+    Stand-in for a Canvas which records the items drawn on it as (item type, coords, options) instead, to be replayed
+        onto any number of canvases or read by renderers other than Tk
+    """
+
+    def __init__(
+            self,
+            width: float,
+            height: float,
+            background_color: str,
+    ):
+        self.width = width
+        self.height = height
+        self.background_color = background_color
+        self.items: list[tuple[str, tuple[float, ...], dict[str, any]]] = list()
+
+    def add_item(self, item_type: str, coords: tuple, options: dict[str, any]) -> None:
+        # coords may be passed as separate values or as one sequence, as with Canvas
+        if len(coords) == 1:
+            coords = coords[0]
+        # font.Font objects belong to a Tk interpreter, so they are stored as font descriptions
+        font_option = options.get("font")
+        if isinstance(font_option, font.Font):
+            options.update({"font": (font_option.cget("family"), font_option.cget("size"), font_option.cget("weight"),
+                                     font_option.cget("slant"))})
+        self.items.append((item_type, tuple(coords), options))
+
+    def create_line(self, *coords, **options) -> None:
+        self.add_item("line", coords, options)
+
+    def create_rectangle(self, *coords, **options) -> None:
+        self.add_item("rectangle", coords, options)
+
+    def create_oval(self, *coords, **options) -> None:
+        self.add_item("oval", coords, options)
+
+    def create_arc(self, *coords, **options) -> None:
+        self.add_item("arc", coords, options)
+
+    def create_polygon(self, *coords, **options) -> None:
+        self.add_item("polygon", coords, options)
+
+    def create_text(self, *coords, **options) -> None:
+        self.add_item("text", coords, options)
+
+    def replay(self, canvas: Canvas) -> None:
+        """
+        Draws every recorded item onto a canvas
+        """
+        item_creators = {"line": canvas.create_line,
+                         "rectangle": canvas.create_rectangle,
+                         "oval": canvas.create_oval,
+                         "arc": canvas.create_arc,
+                         "polygon": canvas.create_polygon,
+                         "text": canvas.create_text,
+                         }
+        for item_type, coords, options in self.items:
+            item_creators[item_type](*coords, **options)
+
+        return
+
+
+# compiled fretboards by the arguments of compile_fretboard, as (fret midpoints, string y coordinates, display list),
+# least recently used first
+fretboard_display_lists: OrderedDict[tuple, tuple[list[float], list[float], DisplayList]] = OrderedDict()
+# most fretboards kept in fretboard_display_lists
+FRETBOARD_CACHE_SIZE = 16
 
 
 def canvas_debug_grid(
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         x_range: tuple[float, float] = (-1000, 1000),
         y_range: tuple[float, float] = (-1000, 1000),
         spacing: float = 50
@@ -31,101 +108,67 @@ def canvas_debug_grid(
 
 
 def title_chart(
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         desc: str,
         top_left_fretboard_coords: tuple[float, float],
         text_color: str,
 ) -> None:
     x_coord, y_coord = top_left_fretboard_coords
-    title_font = font.Font(
-        size=24,
-        family='Quicksand',
-        # weight="bold"
-    )
-    canvas.create_text(x_coord, y_coord, text=desc, fill=text_color, tags="title", anchor=SW, font=title_font)
+    canvas.create_text(x_coord, y_coord, text=desc, fill=text_color, tags="title", anchor=SW, font=TITLE_FONT)
 
 
 def draw_frets(
-        canvas: Canvas,
-        num_frets: int,
-        neck_length: float,
-        neck_width: float,
-        init_x: float,
-        init_y: float,
+        canvas: Canvas | DisplayList,
+        layout: FretboardLayout,
         color: str,
-) -> list[float]:
-
-    two_1_12_amen: float = 2**(-1/12)
-    relative_fret_x_values = [two_1_12_amen**n for n in range(num_frets)]
-    scale_constant = sum(relative_fret_x_values)
-    fret_x_diffs: list[float] = [
-        relative_scale * neck_length / scale_constant
-        for relative_scale in relative_fret_x_values] + [init_x + neck_length]
-
-    # cumsum for x positions
-    fret_x_values: list[float] = [0] + [sum(fret_x_diffs[:i]) for i in range(num_frets)]
+) -> None:
 
+    fret_lo_y, fret_hi_y = layout.fret_y_coords
     # draw last fret
     canvas.create_line(
-        init_x + neck_length, init_y,
-        init_x + neck_length, init_y + neck_width,
+        layout.neck_end_x_coord, fret_lo_y,
+        layout.neck_end_x_coord, fret_hi_y,
         tags="fretboard",
         fill=color,
     )
 
-    for current_fret_x_value in fret_x_values:  # add 1
+    for fret_x_coord in layout.fret_x_coords:
         # draw each fret
         canvas.create_line(
-            current_fret_x_value + init_x, init_y,
-            current_fret_x_value + init_x, init_y + neck_width,
+            fret_x_coord, fret_lo_y,
+            fret_x_coord, fret_hi_y,
             tags="fretboard",
             fill=color,
         )
 
-    # record these for notating fingering positions
-    fret_midpoints: list[float] = [
-        (fret_x_values[i + 1] + fret_x_values[i]) * 0.5 + init_x
-         for i in range(num_frets)
-    ]
-
-    return fret_midpoints
+    return
 
 
 def draw_strings(
-        canvas: Canvas,
-        num_strings: int,
-        neck_scale_constant: float,
-        string_spacing: float,
-        init_x: float,
-        init_y: float,
-        color:str,
-) -> list[float]:
-
-    string_y_values: list[float] = [init_y + i * string_spacing for i in range(num_strings)]
+        canvas: Canvas | DisplayList,
+        layout: FretboardLayout,
+        color: str,
+) -> None:
 
-    for y_value in string_y_values:
+    string_start_x, string_end_x = layout.string_x_coords
+    for y_value in layout.string_y_coords:
         canvas.create_line(
-            init_x, y_value,
-            init_x + neck_scale_constant, y_value,
+            string_start_x, y_value,
+            string_end_x, y_value,
             tags="fretboard",
             fill=color,
         )
 
-    return string_y_values
+    return
 
 
 def label_tuning(
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         tuning: list[str],
         string_y_positions: list[float],
         init_x_coord: float,
         color: str,
 ) -> None:
-    tuning_font = font.Font(
-        size=12,
-        family='Quicksand',
-    )
-
     for i, string_note in enumerate(tuning):
         note_x_position, note_y_position = init_x_coord - 20, string_y_positions[i]
 
@@ -133,102 +176,26 @@ def label_tuning(
         canvas.create_text(
             note_x_position, note_y_position,
             text=string_note, tags="fretboard",
-            justify=RIGHT, font=tuning_font,
+            justify=RIGHT, font=TUNING_FONT,
             fill=color,
         )
     return
 
 
 def draw_fret_markers(
-        canvas: Canvas,
-        num_frets: int,
-        fret_x_midpoints: list[float],
-        string_y_coords: list[float],
-        num_strings: int,
-        single_marker_position: Literal["middle", "top", "bottom", "none"],
-        double_marker_position: Literal["middle", "top", "bottom", "none"],
+        canvas: Canvas | DisplayList,
+        layout: FretboardLayout,
         color: str,
         # todo all single marker option
         # todo check distance between frets to get max radius of marker
 ) -> None:
 
-    num_octaves = num_frets // 12
-    semitones_beyond_whole_octave = num_frets % 12
-    mod_3_markers: list[int] = [3 + 12 * i for i in range(num_octaves + int(semitones_beyond_whole_octave >= 3))]
-    mod_5_markers: list[int] = [5 + 12 * i for i in range(num_octaves + int(semitones_beyond_whole_octave >= 5))]
-    mod_7_markers: list[int] = [7 + 12 * i for i in range(num_octaves + int(semitones_beyond_whole_octave >= 7))]
-    mod_9_markers: list[int] = [9 + 12 * i for i in range(num_octaves + int(semitones_beyond_whole_octave >= 9))]
-    octave_fret_markers: list[int] = [i * 12 for i in range(1, int(num_frets // 12) + 1)]
-    single_frets_to_mark: list[int] = sorted(
-        mod_3_markers + mod_5_markers + mod_7_markers + mod_9_markers
-    )
-
-    num_strings_is_odd: bool = num_strings % 2 == 1
-    # set single marker y positions
-    middle_string: int = num_strings // 2
-    if single_marker_position == "middle":
-        if num_strings_is_odd:
-            single_marker_y_pos = (
-                string_y_coords[middle_string]
-                + string_y_coords[middle_string + 1]) * 0.5
-        else:
-            single_marker_y_pos = (
-                string_y_coords[middle_string - 1]
-                + string_y_coords[middle_string]) * 0.5
-
-    elif single_marker_position == "top":
-        single_marker_y_pos = (string_y_coords[0] + string_y_coords[1]) * 0.5
-    else:
-        single_marker_y_pos = (string_y_coords[-1] + string_y_coords[-2]) * 0.5
-
-    # draw single markers
-    if single_marker_position == "none":
-        pass
-    else:
-        for fret in single_frets_to_mark:
-            single_marker_x_pos = fret_x_midpoints[fret]
-            canvas.create_oval(
-                single_marker_x_pos - MARKER_RADIUS, single_marker_y_pos - MARKER_RADIUS,
-                single_marker_x_pos + MARKER_RADIUS, single_marker_y_pos + MARKER_RADIUS,
-                fill=color, tags="fretboard",
-            )
-
-    # set octave marker y positions
-    if double_marker_position == "middle":
-        # if odd number of strings, doubled markers should be split between the middle string
-        if num_strings_is_odd:
-            marker_1_y_pos = (string_y_coords[middle_string - 1]
-                              + string_y_coords[middle_string]) * 0.5
-            marker_2_y_pos = (string_y_coords[middle_string ]
-                              + string_y_coords[middle_string + 1]) * 0.5
-        # if even number of strings, doubled markers should be split between the strings above and below middle strings
-        else:
-            marker_1_y_pos = (string_y_coords[middle_string - 2] + string_y_coords[middle_string - 1]) * 0.5
-            marker_2_y_pos = (string_y_coords[middle_string] + string_y_coords[middle_string + 1]) * 0.5
-
-    elif double_marker_position == "top":
-        marker_1_y_pos = (string_y_coords[0] + string_y_coords[1]) * 0.5
-        marker_2_y_pos = (string_y_coords[1] + string_y_coords[2]) * 0.5
-    else:
-        marker_1_y_pos = (string_y_coords[-1] + string_y_coords[-2]) * 0.5
-        marker_2_y_pos = (string_y_coords[-2] + string_y_coords[-3]) * 0.5
-
-    # draw octave markers
-    if double_marker_position == "none":
-        pass
-    else:
-        for fret in octave_fret_markers:
-            double_marker_x_pos = fret_x_midpoints[fret]
-            canvas.create_oval(
-                double_marker_x_pos - MARKER_RADIUS, marker_1_y_pos - MARKER_RADIUS,
-                double_marker_x_pos + MARKER_RADIUS, marker_1_y_pos + MARKER_RADIUS,
-                fill=color, tags="fretboard",
-            )
-            canvas.create_oval(
-                double_marker_x_pos - MARKER_RADIUS, marker_2_y_pos - MARKER_RADIUS,
-                double_marker_x_pos + MARKER_RADIUS, marker_2_y_pos + MARKER_RADIUS,
-                fill=color, tags="fretboard",
-            )
+    for marker_x_pos, marker_y_pos in layout.single_marker_coords + layout.double_marker_coords:
+        canvas.create_oval(
+            marker_x_pos - MARKER_RADIUS, marker_y_pos - MARKER_RADIUS,
+            marker_x_pos + MARKER_RADIUS, marker_y_pos + MARKER_RADIUS,
+            fill=color, tags="fretboard",
+        )
 
     return
 
@@ -237,14 +204,9 @@ def notate_fretted_chord_near_nut(
         fretted_notes: list[list[int, int]],
         string_y_positions: list[float],
         nut_x_position: float,
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         annotation_color: str,
 ) -> None:
-    # have to declare in here or we get a 'font declared too early' error
-    annotation_font = font.Font(
-        size=12,
-        family='Quicksand',
-    )
 
     fretted_strings: list[int] = [string_idx for string_idx, fret_idx in fretted_notes]
     fretted_frets: list[int] = [fret_idx for string_idx, fret_idx in fretted_notes]
@@ -258,16 +220,18 @@ def notate_fretted_chord_near_nut(
                 # we use x position - 40 because the tuning is 20 px from the nut
                 nut_x_position - 40, string_y_positions[string_num],
                 text=fret_num,
-                font=annotation_font,
-                fill=annotation_color
+                font=ANNOTATION_FONT,
+                fill=annotation_color,
+                tags="annotation",
             )
 
         else:
             canvas.create_text(
                 nut_x_position - 40, string_y_positions[string_num],
                 text="x",
-                font=annotation_font,
-                fill=annotation_color
+                font=ANNOTATION_FONT,
+                fill=annotation_color,
+                tags="annotation",
             )
 
 
@@ -275,15 +239,10 @@ def notate_barred_chord_near_nut(
         barred_chord: tuple[list[list[int, int]], list[list[int, int]]],
         string_y_positions: list[float],
         nut_x_position: float,
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         # annotation_font: font.Font,
         annotation_color: str,
 ) -> None:
-    # have to declare in here or we get a 'font declared too early' error
-    annotation_font = font.Font(
-        size=12,
-        family='Quicksand',
-    )
 
     fretted_notes, barred_notes = barred_chord
     fretted_strings: list[int] = [string_idx for string_idx, fret_idx in fretted_notes]
@@ -296,8 +255,9 @@ def notate_barred_chord_near_nut(
         canvas.create_text(
             nut_x_position - 40, string_y_positions[string_num],
             text=fret_num,
-            font=annotation_font,
+            font=ANNOTATION_FONT,
             fill=annotation_color,
+            tags="annotation",
         )
 
     # create barre annotation, offset along x-axis by an additional 20 px
@@ -308,6 +268,7 @@ def notate_barred_chord_near_nut(
         (nut_x_position - 60, barre_annotation_y_start,
          nut_x_position - 60, barre_annotation_y_end),
         fill=annotation_color,
+        tags="annotation",
     )
     # arrowhead
     canvas.create_polygon(
@@ -317,25 +278,27 @@ def notate_barred_chord_near_nut(
          nut_x_position - 60, barre_annotation_y_end + 5,
          ],
         fill=annotation_color,
+        tags="annotation",
     )
 
     canvas.create_text(
         (nut_x_position - 72, 0.5 * (barre_annotation_y_start + barre_annotation_y_end)),
         text=barred_notes[0][1],  # barre fret
         fill=annotation_color,
-        font=annotation_font,
+        font=ANNOTATION_FONT,
+        tags="annotation",
     )
 
     return
 
 
 def mark_fret(
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         fret_x_coord: float,
         string_y_coord: float,
         marker_color: str,
         radius: float = MARKER_RADIUS,
-) -> Canvas:
+) -> Canvas | DisplayList:
     canvas.create_oval(
         fret_x_coord - radius, string_y_coord - radius,
         fret_x_coord + radius, string_y_coord + radius,
@@ -345,13 +308,13 @@ def mark_fret(
 
 
 def mark_barre(
-        canvas: Canvas,
+        canvas: Canvas | DisplayList,
         fret_x_coord: float,
         lo_str_y_coord: float,
         hi_str_y_coord: float,
         radius: float = MARKER_RADIUS,
         marker_color: str = "red"
-) -> Canvas:
+) -> Canvas | DisplayList:
     # draw rounded barre endpoints
     canvas = mark_fret(canvas, fret_x_coord, lo_str_y_coord, radius=radius, marker_color=marker_color)
     canvas = mark_fret(canvas, fret_x_coord, hi_str_y_coord, radius=radius, marker_color=marker_color)
@@ -365,10 +328,76 @@ def mark_barre(
     return canvas
 
 
-def make_fretboard(
+def draw_chord_chart(
+        canvas: Canvas | DisplayList,
+        chord,
+        is_barre: bool,
+        title: str,
+        fret_x_coord_midpoints: list[float],
+        string_y_coords: list[float],
+        title_location: tuple[float, float],
+        marker_color: str,
+        label_color: str,
+) -> None:
+    """
+    Draws one chord voicing over a fretboard: its notes, barre, nut annotations and title
+    :param chord: Fretted (string, fret) pairs, or for a barre chord the (fretted pairs, barre bounds) of
+        charting_better.handle_barre_chord
+    :param is_barre: Whether the chord is a barre chord
+    :param fret_x_coord_midpoints: Fret x-coord midpoints of the fretboard
+    :param string_y_coords: String y-coords of the fretboard, in string index order
+    :param title_location: Bottom left corner of the title
+    """
+    chord_fretted_pairs = chord[0] if is_barre else chord
+    for string_idx, fret_idx in chord_fretted_pairs:
+        mark_fret(
+            canvas,
+            fret_x_coord_midpoints[fret_idx],
+            string_y_coords[string_idx],
+            marker_color,
+        )
+
+    if is_barre:
+        lo_pair, hi_pair = chord[1]
+        mark_barre(
+            canvas,
+            fret_x_coord_midpoints[lo_pair[1]],
+            string_y_coords[lo_pair[0]],
+            string_y_coords[hi_pair[0]],
+            marker_color=marker_color,
+        )
+        notate_barred_chord_near_nut(chord, string_y_coords, fret_x_coord_midpoints[0], canvas, label_color)
+    else:
+        notate_fretted_chord_near_nut(chord, string_y_coords, fret_x_coord_midpoints[0], canvas, label_color)
+
+    title_chart(canvas, title, title_location, label_color)
+    return
+
+
+def draw_notes_chart(
+        canvas: Canvas | DisplayList,
+        fret_string_pairs: list[list[int, int]],
+        title: str,
+        fret_x_coord_midpoints: list[float],
+        string_y_coords: list[float],
+        title_location: tuple[float, float],
+        marker_color: str,
+        label_color: str,
+) -> None:
+    """
+    Draws the notes of a scale or arpeggio over a fretboard, with a title; see draw_chord_chart
+    :param fret_string_pairs: (fret, string) of each note, ex. from charting.build_scale
+    """
+    for fret_idx, string_idx in fret_string_pairs:
+        mark_fret(canvas, fret_x_coord_midpoints[fret_idx], string_y_coords[string_idx], marker_color)
+
+    title_chart(canvas, title, title_location, label_color)
+    return
+
+
+def compile_fretboard(
         num_frets: int,
         tuning: list[str] | str,
-        root: Frame,
         fretboard_color: str = "black",
         background_color: str = "white",
         marker_color: str = "black",
@@ -382,30 +411,50 @@ def make_fretboard(
         double_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
         right_handed: bool = True,
         canvas_grid: bool = False,
-) -> tuple[list[float], list[float], Canvas, Frame]:
+) -> tuple[list[float], list[float], DisplayList]:
     """
-
-    :param label_color:
-    :param marker_color:
-    :param background_color:
-    :param fretboard_color:
-    :param num_frets: Number of frets on instrument. Minimum 3.
-    :param tuning: Instrument tuning. Used to infer number of strings. Minimum 3.
-        Format: hyphen-separated notes, ex. "E-A-D-G-B-E"
-    :param neck_scale_constant: Neck length, px
-    :param string_spacing: Px between strings
-    :param init_x_coord: Top left corner x-coord. Default 100 px.
-    :param init_y_coord: Top left corner y-coord. Default 100 px.
-    :param padding: Whitespace between fretboard edges and window edge. Default 50 px.
-    :param single_marker_pos: Position of single fret markers on neck. Default middle.
-    :param double_marker_pos: Position of octave fret markers on neck. Default middle.
-    :param right_handed: If right_handed, notes will be ordered bottom-to-top. Default True.
-    :param canvas_grid: Debugging option. Draws point grid at 50x50px intervals, with text coordinate annotations every
-        250x250px. Default False.
-    :return: list of fret x-coordinate midpoints, list of string y coordinates, canvas object, root object.
+    Draws a fretboard into a display list rather than onto a canvas. Needs no Tk window; the display list is compiled
+        once per set of arguments and kept in fretboard_display_lists, which drops the least recently used fretboard
+        once it is full. See make_fretboard for the parameters.
+    :return: list of fret x-coordinate midpoints, list of string y coordinates, display list
     """
+    fretboard_key = (
+        num_frets, tuning if type(tuning) is str else "-".join(tuning), fretboard_color, background_color,
+        marker_color, label_color, neck_scale_constant, string_spacing, init_x_coord, init_y_coord, padding,
+        single_marker_pos, double_marker_pos, right_handed, canvas_grid)
+    compiled_fretboard = fretboard_display_lists.get(fretboard_key)
+    if compiled_fretboard is None:
+        compiled_fretboard = draw_fretboard(*fretboard_key)
+        fretboard_display_lists.update({fretboard_key: compiled_fretboard})
+        if len(fretboard_display_lists) > FRETBOARD_CACHE_SIZE:
+            fretboard_display_lists.popitem(last=False)
+    else:
+        fretboard_display_lists.move_to_end(fretboard_key)
+
+    fret_x_coord_midpoints, string_y_coords, display_list = compiled_fretboard
+    # callers are free to change the coordinate lists, ex. reversing the strings
+    return list(fret_x_coord_midpoints), list(string_y_coords), display_list
 
-    tuning_list: list[str] = tuning.split("-") if type(tuning) is str else tuning
+
+def draw_fretboard(
+        num_frets: int,
+        tuning: str,
+        fretboard_color: str,
+        background_color: str,
+        marker_color: str,
+        label_color: str,
+        neck_scale_constant: float,
+        string_spacing: float,
+        init_x_coord: float,
+        init_y_coord: float,
+        padding: float,
+        single_marker_pos: Literal["middle", "top", "bottom", "none"],
+        double_marker_pos: Literal["middle", "top", "bottom", "none"],
+        right_handed: bool,
+        canvas_grid: bool,
+) -> tuple[list[float], list[float], DisplayList]:
+
+    tuning_list: list[str] = tuning.split("-")
     num_strings: int = len(tuning_list)
 
     assert len(tuning_list) == num_strings, (
@@ -414,41 +463,28 @@ def make_fretboard(
     assert 2 < num_frets, "Fret number must be greater than 2"
     assert 2 < num_strings, "String number must be greater than 2"
 
-    fretboard_width = string_spacing * (num_strings - 1)
-
-    # boundaries: (-init_x, fretboard_length + init_x)
-    #             (-init_y, string_width + init_y)
-    # => width = 2 * init_x + fretboard_length + padding
-    # => length = 2 * init_y + fretboard_width + padding
-    canvas = Canvas(
-        root,
-        width=neck_scale_constant + 2 * abs(init_x_coord) + padding,
-        height=fretboard_width * 1.2 + abs(init_y_coord) + padding,
-        bg=background_color,
+    layout = get_fretboard_layout(
+        num_frets,
+        num_strings,
+        neck_scale_constant=neck_scale_constant,
+        string_spacing=string_spacing,
+        init_x_coord=init_x_coord,
+        init_y_coord=init_y_coord,
+        padding=padding,
+        single_marker_pos=single_marker_pos,
+        double_marker_pos=double_marker_pos,
+    )
+    canvas = DisplayList(
+        width=layout.width,
+        height=layout.height,
+        background_color=background_color,
     )
 
     if canvas_grid:
         canvas_debug_grid(canvas)
 
-    fret_x_coord_midpoints: list[float] = draw_frets(
-        canvas,
-        num_frets,
-        neck_scale_constant,
-        fretboard_width,
-        init_x_coord,
-        init_y_coord,
-        color=fretboard_color
-    )
-
-    string_y_coords: list[float] = draw_strings(
-        canvas,
-        num_strings,
-        neck_scale_constant,
-        string_spacing,
-        init_x_coord,
-        init_y_coord,
-        color=fretboard_color,
-    )
+    draw_frets(canvas, layout, color=fretboard_color)
+    draw_strings(canvas, layout, color=fretboard_color)
 
     # if right-handed, strings will be drawn from lightest to heaviest
     if right_handed:
@@ -457,19 +493,90 @@ def make_fretboard(
     label_tuning(
         canvas,
         tuning_list,
-        string_y_coords,
+        layout.string_y_coords,
         init_x_coord,
         color=label_color
     )
 
-    draw_fret_markers(
-        canvas,
+    draw_fret_markers(canvas, layout, color=marker_color)
+
+    return list(layout.fret_x_coord_midpoints), list(layout.string_y_coords), canvas
+
+
+def make_fretboard_canvas(
+        display_list: DisplayList,
+        root: Frame,
+) -> Canvas:
+    """
+    Makes a canvas the size of a compiled fretboard and draws it there
+    """
+    canvas = Canvas(
+        root,
+        width=display_list.width,
+        height=display_list.height,
+        bg=display_list.background_color,
+    )
+    display_list.replay(canvas)
+
+    return canvas
+
+
+def make_fretboard(
+        num_frets: int,
+        tuning: list[str] | str,
+        root: Frame,
+        fretboard_color: str = "black",
+        background_color: str = "white",
+        marker_color: str = "black",
+        label_color: str = "black",
+        neck_scale_constant: float = 300,
+        string_spacing: float = 11,
+        init_x_coord: float = 40,
+        init_y_coord: float = 40,
+        padding: float = 20.0,
+        single_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
+        double_marker_pos: Literal["middle", "top", "bottom", "none"] = "middle",
+        right_handed: bool = True,
+        canvas_grid: bool = False,
+) -> tuple[list[float], list[float], Canvas, Frame]:
+    """
+
+    :param label_color:
+    :param marker_color:
+    :param background_color:
+    :param fretboard_color:
+    :param num_frets: Number of frets on instrument. Minimum 3.
+    :param tuning: Instrument tuning. Used to infer number of strings. Minimum 3.
+        Format: hyphen-separated notes, ex. "E-A-D-G-B-E"
+    :param neck_scale_constant: Neck length, px
+    :param string_spacing: Px between strings
+    :param init_x_coord: Top left corner x-coord. Default 100 px.
+    :param init_y_coord: Top left corner y-coord. Default 100 px.
+    :param padding: Whitespace between fretboard edges and window edge. Default 50 px.
+    :param single_marker_pos: Position of single fret markers on neck. Default middle.
+    :param double_marker_pos: Position of octave fret markers on neck. Default middle.
+    :param right_handed: If right_handed, notes will be ordered bottom-to-top. Default True.
+    :param canvas_grid: Debugging option. Draws point grid at 50x50px intervals, with text coordinate annotations every
+        250x250px. Default False.
+    :return: list of fret x-coordinate midpoints, list of string y coordinates, canvas object, root object.
+    """
+    fret_x_coord_midpoints, string_y_coords, display_list = compile_fretboard(
         num_frets,
-        fret_x_coord_midpoints,
-        string_y_coords,
-        num_strings,
-        single_marker_pos, double_marker_pos,
-        color=marker_color,
+        tuning,
+        fretboard_color=fretboard_color,
+        background_color=background_color,
+        marker_color=marker_color,
+        label_color=label_color,
+        neck_scale_constant=neck_scale_constant,
+        string_spacing=string_spacing,
+        init_x_coord=init_x_coord,
+        init_y_coord=init_y_coord,
+        padding=padding,
+        single_marker_pos=single_marker_pos,
+        double_marker_pos=double_marker_pos,
+        right_handed=right_handed,
+        canvas_grid=canvas_grid,
     )
+    canvas = make_fretboard_canvas(display_list, root)
 
     return fret_x_coord_midpoints, string_y_coords, canvas, root
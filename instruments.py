@@ -1,11 +1,39 @@
 from typing import Literal
-from graphics_tk import (make_fretboard, mark_fret, title_chart, mark_barre, notate_fretted_chord_near_nut,
-                         notate_barred_chord_near_nut)
-from charting import (get_instrument_semitones_from_c, convert_chord_to_semitones,
-                      convert_scale_to_semitones, build_scale, build_arpeggio)
-from charting_better import build_chord_better
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
+from graphics_tk import compile_fretboard, draw_chord_chart, draw_notes_chart
+from charting import (get_instrument_semitones_from_c, convert_chord_to_semitones, convert_slash_chord_to_semitones,
+                      get_chord_inversion_bass_notes, convert_scale_to_semitones, build_scale, build_arpeggio)
+from charting_better import (iter_instrument_chord_voicings, iter_retuned_chord_voicings, handle_barre_chord,
+                             SearchBudget)
 from tkinter import Frame, Canvas, font
+from chord_dicts import note_to_index
 from style_dicts import hex_style_dict, hex_colors
+from voicing_database import VoicingDatabase, open_voicing_database
+from voicing_scoring import select_top_voicings
+from voice_leading import plan_progression_voicings
+
+
+# the last kept full search of each (num_frets, chord_root, chord_type, bass_note), as (semitones_from_c, voicings),
+# least recently used first; an instrument retuned on one string reuses it rather than searching again. See
+# charting_better.iter_retuned_chord_voicings and Instrument.iter_found_chord_fret_pairs
+recent_chord_voicings: OrderedDict[tuple[int, str, str, str | None],
+                                   tuple[list[list[int]], list[tuple[list[tuple[int, int]], bool]]]] = OrderedDict()
+# most searches kept in recent_chord_voicings
+RECENT_CHORD_VOICINGS_SIZE = 8
+# process pools for chord searches, by number of workers; shared by every instrument and kept for the whole session
+chord_search_executors: dict[int, ProcessPoolExecutor] = dict()
+
+
+def get_chord_search_executor(num_workers: int) -> ProcessPoolExecutor:
+    executor = chord_search_executors.get(num_workers)
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=num_workers)
+        chord_search_executors.update({num_workers: executor})
+
+    return executor
 
 
 class Instrument:
@@ -26,6 +54,8 @@ class Instrument:
             canvas_grid: bool = False,
             marker_radius: float = 4,
             style: str = 'Dark mode',
+            write_back_voicings: bool = False,
+            search_workers: int = 1,
     ):
         """
         :param num_frets: Number of frets on instrument. Minimum 3.
@@ -42,6 +72,10 @@ class Instrument:
         :param canvas_grid: Debugging option. Draws point grid at 50x50px intervals, with text coordinate annotations every
             250x250px. Default False.
         :param marker_radius: radius (px) of fretted notes
+        :param write_back_voicings: If True, chords missing from the voicing database are stored in it once computed,
+            creating a database for this instrument if there is none. Default False.
+        :param search_workers: Number of processes that chords missing from the voicing database are searched on.
+            Default 1 (search in this process).
         :return: list of fret x-coordinate midpoints, list of string y coordinates, canvas object, root object.
         """
         self.num_frets = num_frets
@@ -52,16 +86,23 @@ class Instrument:
             self.num_frets,
             self.tuning_list,
         )
+        self.write_back_voicings = write_back_voicings
+        self.voicing_database: VoicingDatabase | None = open_voicing_database(
+            self.num_frets,
+            self.tuning,
+            create=self.write_back_voicings,
+        )
+        self.search_workers = search_workers
 
         self.style = style
         color_keys = hex_style_dict.get(self.style)
         self.fretboard_color, self.background_color, self.fret_marker_color, self.note_marker_color, self.label_color = \
             [hex_colors.get(color) for color in color_keys]
         self.display_frame = display_frame
-        self.fret_x_coord_midpoints, self.string_y_coords, self.template_canvas, self.display_frame = make_fretboard(
+        # the fretboard is compiled once per geometry and style, and drawn onto every chart from the display list
+        self.fret_x_coord_midpoints, self.string_y_coords, self.fretboard_display_list = compile_fretboard(
             self.num_frets,
             self.tuning,
-            self.display_frame,
             fretboard_color=self.fretboard_color,
             background_color=self.background_color,
             marker_color=self.fret_marker_color,
@@ -76,6 +117,9 @@ class Instrument:
             right_handed=right_handed,
             canvas_grid=canvas_grid,
         )
+        # charts are sized from the layout, so building an instrument makes no widgets
+        self.chart_width: float = self.fretboard_display_list.width
+        self.chart_height: float = self.fretboard_display_list.height
 
         # set title location to top left
         self.title_location: tuple[float, float] = self.fret_x_coord_midpoints[0], self.string_y_coords[0]
@@ -88,33 +132,69 @@ class Instrument:
 
     def copy_fretboard_to(self, destination_canvas: Canvas) -> None:
 
-        for item_id in self.template_canvas.find_all():
-            item_coords = self.template_canvas.coords(item_id)
-            item_type = self.template_canvas.type(item_id)
-            item_options = self.template_canvas.itemconfigure(item_id)
-            item_options_processed: dict[str: any] = {}
-
-            # have to exclude irrelevant options, which are of the form {'key': ('key', '', '', '', '')}
-            # relevant options will have the form {'key': ('key', '', '', true_val, true_val)};
-            #   true vals are duplicated for some reason
-            for key, vals in item_options.items():
-                if all([val == '' for val in vals[1:]]):
-                    pass
-                else:
-                    true_val = vals[-1]
-                    item_options_processed.update({key: true_val})
-
-            if item_type == "line":
-                destination_canvas.create_line(*item_coords, **item_options_processed,)
-            elif item_type == "rectangle":
-                destination_canvas.create_rectangle(*item_coords, **item_options_processed,)
-            elif item_type == "text":
-                destination_canvas.create_text(*item_coords, **item_options_processed,)
-            elif item_type == "oval":
-                destination_canvas.create_oval(*item_coords, **item_options_processed,)
+        self.fretboard_display_list.replay(destination_canvas)
+        return
+
+    def make_chart_canvas(self, master: Frame) -> Canvas:
+        """
+        Makes a canvas with this instrument's fretboard drawn on it, for charts to be drawn over
+        """
+        chart_canvas = Canvas(
+            master=master,
+            bg=self.background_color,
+            width=self.chart_width,
+            height=self.chart_height,
+        )
+        # add fretboard to this canvas
+        self.copy_fretboard_to(chart_canvas)
+
+        return chart_canvas
 
+    def draw_chord_voicing(
+            self,
+            chord_chart: Canvas,
+            chord,
+            is_barre: bool,
+            title: str,
+    ) -> None:
+        """
+        Draws one chord voicing over a canvas from make_chart_canvas, replacing any voicing drawn on it before. Only the
+            items tagged "chord", "annotation" and "title" are redrawn; the fretboard is left as it is.
+        :param chord: Fretted (string, fret) pairs, or for a barre chord the (fretted pairs, barre bounds) of
+            handle_barre_chord
+        :param is_barre: Whether the chord is a barre chord
+        :param title: Chart title
+        """
+        chord_chart.delete("chord", "annotation", "title")
+        draw_chord_chart(
+            chord_chart,
+            chord,
+            is_barre,
+            title,
+            self.fret_x_coord_midpoints,
+            self.string_y_coords,
+            self.title_location,
+            self.note_marker_color,
+            self.label_color,
+        )
         return
 
+    def make_chord_chart(
+            self,
+            master: Frame,
+            chord,
+            is_barre: bool,
+            title: str,
+    ) -> Canvas:
+        """
+        Draws one chord voicing on a new canvas; see draw_chord_voicing
+        :param master: Frame to put the canvas in
+        """
+        this_chord_chart = self.make_chart_canvas(master)
+        self.draw_chord_voicing(this_chord_chart, chord, is_barre, title)
+
+        return this_chord_chart
+
     def display_chord_voicings(
             self,
             fretted_pairs,
@@ -125,83 +205,12 @@ class Instrument:
     ) -> list[Canvas]:
 
         chords_canvases: list[Canvas] = list()
-        current_canvas_idx = 0
+        chords = [(barred_chord, True) for barred_chord in barred_pairs] + \
+                 [(fretted_chord, False) for fretted_chord in fretted_pairs]
 
-        for barred_chord in barred_pairs:
+        for current_canvas_idx, (chord, is_barre) in enumerate(chords):
             current_page = pages[current_canvas_idx // canvases_per_page]
-            this_chord_chart = Canvas(
-                master=current_page,
-                bg=self.background_color,
-                width=self.template_canvas.winfo_reqwidth(),
-                height=self.template_canvas.winfo_reqheight(),
-            )
-            # add fretboard to this canvas
-            self.copy_fretboard_to(this_chord_chart)
-
-            this_chord_fretted_pairs, this_chord_barre_bounds = barred_chord
-            for string_idx, fret_idx in this_chord_fretted_pairs:
-                mark_fret(
-                    this_chord_chart,
-                    self.fret_x_coord_midpoints[fret_idx],
-                    self.string_y_coords[string_idx],
-                    self.note_marker_color,
-                )
-
-            lo_pair, hi_pair = this_chord_barre_bounds
-            fret_x_coord = self.fret_x_coord_midpoints[lo_pair[1]]
-            lo_y_coord = self.string_y_coords[lo_pair[0]]
-            hi_y_coord = self.string_y_coords[hi_pair[0]]
-            mark_barre(
-                this_chord_chart,
-                fret_x_coord,
-                lo_y_coord,
-                hi_y_coord,
-                marker_color=self.note_marker_color,
-            )
-
-            notate_barred_chord_near_nut(
-                barred_chord,
-                self.string_y_coords,
-                self.fret_x_coord_midpoints[0],
-                this_chord_chart,
-                self.label_color,
-            )
-
-            title_chart(this_chord_chart, title, self.title_location, self.label_color)
-            chords_canvases.append(this_chord_chart)
-            current_canvas_idx += 1
-
-        for fretted_chord in fretted_pairs:
-
-            current_page = pages[current_canvas_idx // canvases_per_page]
-            this_chord_chart = Canvas(
-                master=current_page,
-                bg=self.background_color,
-                width=self.template_canvas.winfo_reqwidth(),
-                height=self.template_canvas.winfo_reqheight(),
-            )
-            # add fretboard to this canvas
-            self.copy_fretboard_to(this_chord_chart)
-
-            for string_idx, fret_idx in fretted_chord:
-                mark_fret(
-                    this_chord_chart,
-                    self.fret_x_coord_midpoints[fret_idx],
-                    self.string_y_coords[string_idx],
-                    self.note_marker_color,
-                )
-
-            notate_fretted_chord_near_nut(
-                fretted_chord,
-                self.string_y_coords,
-                self.fret_x_coord_midpoints[0],
-                this_chord_chart,
-                self.label_color,
-            )
-
-            title_chart(this_chord_chart, title, self.title_location, self.label_color)
-            chords_canvases.append(this_chord_chart)
-            current_canvas_idx += 1
+            chords_canvases.append(self.make_chord_chart(current_page, chord, is_barre, title))
 
         for i, canvas in enumerate(chords_canvases):
             # put canvases below all menu items
@@ -214,48 +223,268 @@ class Instrument:
             self,
             fretted_pairs: list[list[int, int]],
             title: str,
+            master: Frame | None = None,
     ):
-        # no scrolling so no need to nest in a window in a canvas; pack in display frame
-        chart_canvas = Canvas(
-                master=self.display_frame,
-                bg=self.background_color,
-                width=self.template_canvas.winfo_reqwidth(),
-                height=self.template_canvas.winfo_reqheight(),
+        # no scrolling so no need to nest in a window in a canvas; pack in display frame unless given another
+        chart_canvas = self.make_chart_canvas(self.display_frame if master is None else master)
+        draw_notes_chart(
+            chart_canvas,
+            fretted_pairs,
+            title,
+            self.fret_x_coord_midpoints,
+            self.string_y_coords,
+            self.title_location,
+            self.note_marker_color,
+            self.label_color,
+        )
+        return chart_canvas
+
+
+    def iter_chord_fret_pairs(
+            self,
+            chord_root: str,
+            chord_type: str,
+            limit: int | None = None,
+            bass_note: str | None = None,
+            budget: SearchBudget | None = None,
+            keep_voicings: bool = False,
+    ):
+        """
+        Yields every voicing of the chord as (string_fret_tuples, is_barre), one starting string at a time. Chords are
+            read from the voicing database if stored there, or else recomputed only on the retuned string if the same
+            chord was last searched and kept on this instrument with one string tuned differently.
+        :param chord_root: Root note
+        :param chord_type: Type of chord (see chord_dicts.chords_to_intervals)
+        :param limit: Stop after this many voicings. Default None (no limit).
+        :param bass_note: Lowest note of every voicing, for inversions and slash chords (see
+            charting.convert_slash_chord_to_semitones). Default None (the root).
+        :param budget: Deadline and cancellation of the search; once it is exhausted the voicings stop early and
+            budget.is_exhausted is set. Default None (search everything).
+        :param keep_voicings: If True and every voicing is read out, keep them for retunings and the voicing database
+            (see iter_found_chord_fret_pairs). Only for callers which hold every voicing anyway; otherwise voicings
+            are yielded without being held. Default False.
+        """
+        if bass_note is not None and note_to_index.get(bass_note) == note_to_index.get(chord_root):
+            bass_note = None
+
+        if self.voicing_database is not None and bass_note is None:
+            stored_voicings = self.voicing_database.lookup(chord_root, chord_type)
+            if stored_voicings is not None:
+                yield from islice(stored_voicings, limit)
+                return
+
+        if bass_note is None:
+            intervals_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+        else:
+            intervals_in_chord = convert_slash_chord_to_semitones(chord_type, chord_root, bass_note)
+        recent_chord_key = (self.num_frets, chord_root, chord_type, bass_note)
+        recent_semitones_from_c, recent_voicings = recent_chord_voicings.get(recent_chord_key, (list(), list()))
+        if recent_voicings:
+            recent_chord_voicings.move_to_end(recent_chord_key)
+        num_retuned_strings = sum(
+            recent_string_semitones != string_semitones
+            for recent_string_semitones, string_semitones in zip(recent_semitones_from_c, self.semitones_from_c))
+        if len(recent_semitones_from_c) == self.num_strings and num_retuned_strings <= 1:
+            voicings = iter_retuned_chord_voicings(
+                recent_voicings,
+                recent_semitones_from_c,
+                self.semitones_from_c,
+                intervals_in_chord,
+                budget=budget,
             )
-        self.copy_fretboard_to(chart_canvas)
+            yield from self.iter_found_chord_fret_pairs(recent_chord_key, voicings, limit, budget, keep_voicings)
+            return
+
+        # a limited search usually stops within the first starting string, which is quicker to search here than to
+        # hand out to every worker
+        executor = get_chord_search_executor(self.search_workers) if self.search_workers > 1 and limit is None else None
+        voicings = iter_instrument_chord_voicings(
+            self.semitones_from_c,
+            intervals_in_chord,
+            executor=executor,
+            budget=budget,
+        )
+        yield from self.iter_found_chord_fret_pairs(recent_chord_key, voicings, limit, budget, keep_voicings)
 
-        for fret_idx, string_idx in fretted_pairs:
-            fret_x_coord = self.fret_x_coord_midpoints[fret_idx]
-            string_y_coord = self.string_y_coords[string_idx]
-            mark_fret(chart_canvas, fret_x_coord, string_y_coord, self.note_marker_color)
 
-        title_chart(chart_canvas, title, self.title_location, self.label_color)
-        return chart_canvas
+    def iter_found_chord_fret_pairs(
+            self,
+            recent_chord_key: tuple[int, str, str, str | None],
+            voicings,
+            limit: int | None = None,
+            budget: SearchBudget | None = None,
+            keep_voicings: bool = False,
+    ):
+        """
+        Yields the voicings of a chord search. If keep_voicings is set and the consumer reads the search to the end,
+            keeps the result for retunings and, if write_back_voicings is set, stores it in the voicing database.
+        :param recent_chord_key: (num_frets, chord_root, chord_type, bass_note) of the chord; see recent_chord_voicings
+        :param budget: Budget of the search; a search it stopped early is not kept
+        :param keep_voicings: Whether to hold the voicings as they are yielded, to keep them. Default False.
+        """
+        if limit is not None:
+            yield from islice(voicings, limit)
+            return
+        if not keep_voicings:
+            yield from voicings
+            return
+
+        found_voicings: list[tuple[list[tuple[int, int]], bool]] = list()
+        for voicing in voicings:
+            found_voicings.append(voicing)
+            yield voicing
+
+        if budget is not None and budget.is_exhausted:
+            return
+        recent_chord_voicings.update({recent_chord_key: (self.semitones_from_c, found_voicings)})
+        recent_chord_voicings.move_to_end(recent_chord_key)
+        if len(recent_chord_voicings) > RECENT_CHORD_VOICINGS_SIZE:
+            recent_chord_voicings.popitem(last=False)
+        # so that the next lookup of this chord is read from the database
+        _, chord_root, chord_type, bass_note = recent_chord_key
+        if self.voicing_database is not None and self.write_back_voicings and bass_note is None:
+            self.voicing_database.store(chord_root, chord_type, found_voicings)
 
 
     def get_chord_fret_pairs(
             self,
             chord_root: str,
             chord_type: str,
+            limit: int | None = None,
+            top_k: int | None = None,
+            bass_note: str | None = None,
             ) -> tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]:
+        """
+        :param limit: Stop searching after this many voicings. Default None (no limit).
+        :param top_k: Keep only the top_k most playable voicings, easiest first (see voicing_scoring.score_voicing).
+            Default None (keep every voicing, in canonical order).
+        :param bass_note: Lowest note of every voicing; see iter_chord_fret_pairs. Default None (the root).
+        :return: fretted voicings, barre voicings split by handle_barre_chord
+        """
+        all_fretted_chords, all_barred_chords, _ = self.search_chord_fret_pairs(
+            chord_root, chord_type, limit=limit, top_k=top_k, bass_note=bass_note)
 
-        intervals_in_chord = convert_chord_to_semitones(chord_type, chord_root)
-        minimum_strings_needed = len(intervals_in_chord)
-        all_fretted_chords, all_barred_chords = list(), list()
-        # repeat the procedure until we use the very least number of strings needed to form the chord
-        for starting_idx in range(self.num_strings - minimum_strings_needed + 1):
-            fretted_chords, barred_chords = build_chord_better(
-                self.semitones_from_c,
-                intervals_in_chord,
-                starting_string_idx=starting_idx,
-            )
+        return all_fretted_chords, all_barred_chords
+
+
+    def search_chord_fret_pairs(
+            self,
+            chord_root: str,
+            chord_type: str,
+            deadline: float | None = None,
+            cancel_event=None,
+            limit: int | None = None,
+            top_k: int | None = None,
+            bass_note: str | None = None,
+    ) -> tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]], bool]:
+        """
+        get_chord_fret_pairs within a time budget, or until cancelled. A search which runs out of budget returns the
+            voicings found up to then, the top_k most playable of them if top_k is given.
+        :param deadline: time.monotonic() time to stop searching at. Default None (no deadline).
+        :param cancel_event: threading.Event or anything else with is_set(); the search stops once it is set. Default
+            None (cannot be cancelled).
+        :return: fretted voicings, barre voicings split by handle_barre_chord, and whether the search was stopped
+            early, leaving the voicings partial
+        """
+        budget = SearchBudget(deadline, cancel_event)
+        # every voicing is returned unless ranked, so keeping them costs nothing more
+        voicings = self.iter_chord_fret_pairs(
+            chord_root, chord_type, limit=limit, bass_note=bass_note, budget=budget, keep_voicings=top_k is None)
+        if top_k is not None:
+            voicings = select_top_voicings(voicings, top_k)
 
-            for chord in fretted_chords:
+        all_fretted_chords, all_barred_chords = list(), list()
+        for chord, is_barre in voicings:
+            if is_barre:
+                all_barred_chords.append(handle_barre_chord(chord))
+            else:
                 all_fretted_chords.append(chord)
-            for chord in barred_chords:
-                all_barred_chords.append(chord)
 
-        return all_fretted_chords, all_barred_chords
+        return all_fretted_chords, all_barred_chords, budget.is_exhausted
+
+
+    def stream_chord_fret_pairs(
+            self,
+            chord_root: str,
+            chord_type: str,
+            voicing_queue: Queue,
+            deadline: float | None = None,
+            cancel_event=None,
+            top_k: int | None = None,
+            bass_note: str | None = None,
+            batch_size: int = 16,
+    ) -> None:
+        """
+        search_chord_fret_pairs for a worker thread, putting the voicings on a queue as they are found rather than
+            returning them, so that they can be displayed while the search goes on. Touches no Tk widgets.
+        :param voicing_queue: Gets (voicings, is_done, is_partial) items. voicings is a list of (chord, is_barre), chord
+            being split by handle_barre_chord if is_barre; the last item has is_done set, and is_partial if the search
+            was stopped early.
+        :param batch_size: Number of voicings put on the queue at once, besides the last
+        """
+        budget = SearchBudget(deadline, cancel_event)
+        # unless ranked, every voicing is displayed and so held by the consumer anyway
+        voicings = self.iter_chord_fret_pairs(
+            chord_root, chord_type, bass_note=bass_note, budget=budget, keep_voicings=top_k is None)
+        if top_k is not None:
+            voicings = select_top_voicings(voicings, top_k)
+
+        voicing_batch: list = list()
+        for chord, is_barre in voicings:
+            voicing_batch.append((handle_barre_chord(chord) if is_barre else chord, is_barre))
+            if len(voicing_batch) == batch_size:
+                voicing_queue.put((voicing_batch, False, False))
+                voicing_batch = list()
+            # a cancelled search stops at once, even while voicings are still being read out of a finished search
+            if budget.check():
+                break
+
+        voicing_queue.put((voicing_batch, True, budget.is_exhausted))
+        return
+
+
+    def get_chord_fret_pairs_by_inversion(
+            self,
+            chord_root: str,
+            chord_type: str,
+            top_k: int | None = None,
+    ) -> dict[str, tuple[list[list[tuple[int, int]]], list[tuple[list[tuple[int, int]], list[tuple[int, int]]]]]]:
+        """
+        Gets the voicings of every inversion of a chord, each searched with its bass note fixed on the lowest string
+        :param top_k: Keep only the top_k most playable voicings of each inversion. Default None (keep every voicing).
+        :return: get_chord_fret_pairs of each inversion, keyed by bass note as spelled in the chord (see
+            charting.spell_chord_note), root position first
+        """
+        return {
+            bass_note: self.get_chord_fret_pairs(chord_root, chord_type, top_k=top_k, bass_note=bass_note)
+            for bass_note in get_chord_inversion_bass_notes(chord_type, chord_root)}
+
+
+    def get_progression_voicings(
+            self,
+            chord_roots: list[str],
+            chord_types: list[str],
+            top_k: int | None = None,
+    ) -> list[tuple[list[tuple[int, int]], bool]]:
+        """
+        Picks one voicing per chord of a progression with the least hand movement and voice motion over the whole
+            progression (see voice_leading.plan_progression_voicings)
+        :param chord_roots: Root of each chord, ex. from chord_calc.chord_roots_from_progression
+        :param chord_types: Type of each chord (see chord_dicts.chords_to_intervals)
+        :param top_k: Only consider the top_k most playable voicings of each chord. Default None (consider all).
+        :return: (string_fret_tuples, is_barre) of each chord; empty if any chord has no voicings
+        """
+        assert len(chord_roots) == len(chord_types), \
+            f"The lengths of the chord roots ({len(chord_roots)}) and chord types ({len(chord_types)}) must match"
+
+        progression_voicings: list[list[tuple[list[tuple[int, int]], bool]]] = list()
+        for chord_root, chord_type in zip(chord_roots, chord_types):
+            voicings = self.iter_chord_fret_pairs(chord_root, chord_type, keep_voicings=top_k is None)
+            progression_voicings.append(list(voicings) if top_k is None else select_top_voicings(voicings, top_k))
+
+        voicing_idxs = plan_progression_voicings(progression_voicings, self.num_strings)
+
+        return [voicings[voicing_idx] for voicings, voicing_idx in zip(progression_voicings, voicing_idxs)]
 
 
     def get_scale(
@@ -282,6 +511,39 @@ class Instrument:
         return fret_string_pairs
 
 
+# instruments shared by every screen, by (num_frets, tuning, style), least recently used first; see get_instrument
+instrument_cache: OrderedDict[tuple[int, str, str], Instrument] = OrderedDict()
+# most instruments kept in instrument_cache
+INSTRUMENT_CACHE_SIZE = 8
+
+
+def get_instrument(
+        num_frets: int,
+        tuning: str,
+        style: str,
+        display_frame: Frame,
+) -> Instrument:
+    """
+    Gets the instrument with these frets, tuning and style from instrument_cache, building it only if it is not there.
+        The least recently used instrument is evicted once the cache is full; instruments hold no widgets, so there is
+        nothing to destroy.
+    :param display_frame: Display frame of the instrument if it has to be built. Charts can be put elsewhere by giving
+        make_chart_canvas or display_voicing another master.
+    """
+    instrument_key = (num_frets, tuning, style)
+    instrument = instrument_cache.get(instrument_key)
+    if instrument is not None:
+        instrument_cache.move_to_end(instrument_key)
+        return instrument
+
+    instrument = Instrument(num_frets, tuning, display_frame, style=style)
+    instrument_cache.update({instrument_key: instrument})
+    if len(instrument_cache) > INSTRUMENT_CACHE_SIZE:
+        instrument_cache.popitem(last=False)
+
+    return instrument
+
+
 if __name__ == '__main__':
     # todo fix scrollbar using https://stackoverflow.com/questions/3085696/adding-a-scrollbar-to-a-group-of-widgets-in-tkinter
     pass
@@ -67,5 +67,221 @@ def graphics_test():
         root.mainloop()
 
 
+# (preset, chord types, roots) the chord engines are checked against build_chord_better on, over every starting string
+engine_parity_cases = [
+    ('Standard guitar', [' major', 'm7', 'sus4', 'o7', 'M11'], ['C', 'E', 'F#', 'Bb']),
+    ('Standard bass', [' major', 'M11', 'o', 'o9'], ['C', 'E', 'G']),
+    ('7-string guitar', [' major', 'm7', 'M9'], ['C', 'Ab']),
+]
+
+
+def assert_engine_matches_build_chord_better(build_chord) -> None:
+    from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+    from charting_better import build_chord_better
+    from style_dicts import instrument_presets
+
+    num_empty_chords = 0
+    for preset, chord_types, chord_roots in engine_parity_cases:
+        num_frets, tuning = instrument_presets[preset]
+        semitones_from_c = get_instrument_semitones_from_c(num_frets, tuning.split("-"))
+        for chord_type in chord_types:
+            for chord_root in chord_roots:
+                semitones_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+                for starting_idx in range(len(semitones_from_c) - len(semitones_in_chord) + 1):
+                    expected = build_chord_better(
+                        semitones_from_c, semitones_in_chord, starting_string_idx=starting_idx)
+                    found = build_chord(semitones_from_c, semitones_in_chord, starting_string_idx=starting_idx)
+                    assert found == expected, f"{preset}, {chord_root}{chord_type}, starting string {starting_idx}"
+                    num_empty_chords += not any(expected)
+
+    # the cases include chords with no voicings on some starting strings (ex. M11 on the bass), which must stay empty
+    assert num_empty_chords > 0
+
+
+def test_backtracking_matches_build_chord_better():
+    from charting_better import build_chord_backtracking
+    assert_engine_matches_build_chord_better(build_chord_backtracking)
+
+
+def test_vectorized_matches_build_chord_better():
+    import pytest
+    pytest.importorskip("numpy")
+    from charting_vectorized import build_chord_vectorized
+    assert_engine_matches_build_chord_better(build_chord_vectorized)
+
+
+def test_spell_chord_note():
+    from charting import spell_chord_note
+    assert spell_chord_note('C', '3') == 'E'
+    assert spell_chord_note('Eb', 'b3') == 'Gb'
+    assert spell_chord_note('F#', '3') == 'A#'
+    assert spell_chord_note('Bb', 'b7') == 'Ab'
+    assert spell_chord_note('Ab', 'b3') == 'Cb'
+
+
+def test_get_chord_inversion_bass_notes():
+    from charting import get_chord_inversion_bass_notes
+    assert get_chord_inversion_bass_notes('7', 'C') == ['C', 'E', 'G', 'Bb']
+    assert get_chord_inversion_bass_notes(' major', 'Bb') == ['Bb', 'D', 'F']
+    assert get_chord_inversion_bass_notes('m', 'Eb') == ['Eb', 'Gb', 'Bb']
+    # the repeated root of a power chord is one inversion
+    assert get_chord_inversion_bass_notes(' power chord', 'C') == ['C', 'G']
+
+
+def test_convert_slash_chord_to_semitones():
+    from charting import convert_slash_chord_to_semitones, get_chord_inversion_bass_notes
+    # every inversion of C7, then a bass note outside the chord
+    assert [convert_slash_chord_to_semitones('7', 'C', bass_note)
+            for bass_note in get_chord_inversion_bass_notes('7', 'C')] == [
+        [0, 4, 7, 10], [4, 0, 7, 10], [7, 0, 4, 10], [10, 0, 4, 7]]
+    assert convert_slash_chord_to_semitones(' major', 'C', 'D') == [2, 0, 4, 7]
+    # a flat-named root and bass, Bb at 10 semitones from C
+    assert convert_slash_chord_to_semitones(' major', 'Bb', 'Bb') == [10, 2, 5]
+    assert convert_slash_chord_to_semitones(' major', 'Bb', 'D') == [2, 10, 5]
+    assert convert_slash_chord_to_semitones(' major', 'C', 'Bb') == [10, 0, 4, 7]
+
+
+def test_retuned_matches_fresh_search():
+    from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+    from charting_better import iter_instrument_chord_voicings, iter_retuned_chord_voicings
+
+    previous_semitones_from_c = get_instrument_semitones_from_c(22, "E-A-D-G-B-E".split("-"))
+    # drop D on the lowest string, then a middle string moved so the fret ranges change
+    for tuning in ["D-A-D-G-B-E", "E-A-C#-G-B-E"]:
+        semitones_from_c = get_instrument_semitones_from_c(22, tuning.split("-"))
+        for chord_type, chord_root in [(' major', 'C'), ('m7', 'A'), ('sus4', 'D'), ('7', 'Bb')]:
+            semitones_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+            previous_voicings = list(iter_instrument_chord_voicings(previous_semitones_from_c, semitones_in_chord))
+            expected = list(iter_instrument_chord_voicings(semitones_from_c, semitones_in_chord))
+            found = list(iter_retuned_chord_voicings(
+                previous_voicings, previous_semitones_from_c, semitones_from_c, semitones_in_chord))
+            assert found == expected, f"{tuning}, {chord_root}{chord_type}"
+
+
+def assert_plan_matches_brute_force() -> None:
+    from itertools import islice, product
+    from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+    from charting_better import iter_instrument_chord_voicings
+    from voice_leading import plan_progression_voicings, get_transition_costs, voice_leading_weights
+    from voicing_scoring import score_voicing
+
+    semitones_from_c = get_instrument_semitones_from_c(22, "E-A-D-G-B-E".split("-"))
+    progression_voicings = [
+        list(islice(iter_instrument_chord_voicings(
+            semitones_from_c, convert_chord_to_semitones(chord_type, chord_root)), 6))
+        for chord_root, chord_type in [('C', ' major'), ('A', 'm'), ('F', ' major'), ('G', '7')]]
+    transition_costs = [
+        get_transition_costs(previous_voicings, voicings, len(semitones_from_c))
+        for previous_voicings, voicings in zip(progression_voicings[:-1], progression_voicings[1:])]
+
+    def get_path_cost(voicing_idxs) -> float:
+        return (sum(voice_leading_weights.get('playability') * score_voicing(*voicings[voicing_idx])
+                    for voicings, voicing_idx in zip(progression_voicings, voicing_idxs))
+                + sum(chord_transition_costs[previous_idx][voicing_idx] for chord_transition_costs, previous_idx,
+                      voicing_idx in zip(transition_costs, voicing_idxs[:-1], voicing_idxs[1:])))
+
+    voicing_idxs = plan_progression_voicings(progression_voicings, len(semitones_from_c))
+    # ties may pick a different path of the same cost
+    lowest_path_cost = min(get_path_cost(path) for path in product(
+        *[range(len(voicings)) for voicings in progression_voicings]))
+    assert abs(get_path_cost(voicing_idxs) - lowest_path_cost) < 1e-9
+
+
+def test_plan_progression_voicings_matches_brute_force(monkeypatch):
+    import voice_leading
+    assert_plan_matches_brute_force()
+    # the plain python transition costs, as without numpy
+    monkeypatch.setattr(voice_leading, "np", None)
+    assert_plan_matches_brute_force()
+
+
+def test_identify_chord_round_trip():
+    from charting import convert_chord_to_semitones
+    from chord_dicts import chords_to_intervals, note_to_index
+    from chord_identification import identify_chord
+
+    for chord_type in chords_to_intervals.keys():
+        for chord_root, root_semitones in note_to_index.items():
+            # one open string per chord note, root on the lowest
+            semitones_from_c = [[semitones] for semitones in convert_chord_to_semitones(chord_type, chord_root)]
+            chord_matches = identify_chord([(string, 0) for string in range(len(semitones_from_c))], semitones_from_c)
+            assert any(note_to_index.get(match_root) == root_semitones and match_type == chord_type
+                       for match_root, match_type in chord_matches), f"{chord_root}{chord_type}"
+            assert note_to_index.get(chord_matches[0][0]) == root_semitones, f"{chord_root}{chord_type}"
+
+
+class CancelAfterChecks:
+    """
+    Cancel event which becomes set after a number of checks, to stop a search partway through
+    """
+
+    def __init__(self, num_checks: int):
+        self.num_checks = num_checks
+
+    def is_set(self) -> bool:
+        self.num_checks -= 1
+        return self.num_checks < 0
+
+
+def test_exhausted_budget_gives_prefix():
+    from threading import Event
+    from time import monotonic
+    from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+    from charting_better import iter_instrument_chord_voicings, SearchBudget
+
+    semitones_from_c = get_instrument_semitones_from_c(22, "E-A-D-G-B-E".split("-"))
+    semitones_in_chord = convert_chord_to_semitones('m7', 'A')
+    all_voicings = list(iter_instrument_chord_voicings(semitones_from_c, semitones_in_chord))
+    cancel_event = Event()
+    cancel_event.set()
+    for budget in [SearchBudget(cancel_event=cancel_event), SearchBudget(deadline=monotonic() - 1),
+                   SearchBudget(cancel_event=CancelAfterChecks(40))]:
+        voicings = list(iter_instrument_chord_voicings(semitones_from_c, semitones_in_chord, budget=budget))
+        assert budget.is_exhausted
+        assert len(voicings) < len(all_voicings) and voicings == all_voicings[:len(voicings)]
+
+
+def test_instrument_search_budget_gives_partial_prefix():
+    from threading import Event
+    from time import monotonic
+    from instruments import Instrument, recent_chord_voicings
+
+    instrument = Instrument(22, "E-A-D-G-B-E", None)
+    # stored voicings are read out whatever the budget
+    instrument.voicing_database = None
+    all_fretted_chords, all_barred_chords, is_partial = instrument.search_chord_fret_pairs('C', ' major')
+    assert not is_partial
+    cancel_event = Event()
+    cancel_event.set()
+    for search_kwargs in [{'cancel_event': cancel_event}, {'deadline': monotonic() - 1},
+                          {'cancel_event': CancelAfterChecks(40)}]:
+        # a kept complete search would be reused rather than searched again
+        recent_chord_voicings.clear()
+        fretted_chords, barred_chords, is_partial = instrument.search_chord_fret_pairs('C', ' major', **search_kwargs)
+        assert is_partial
+        assert fretted_chords == all_fretted_chords[:len(fretted_chords)]
+        assert barred_chords == all_barred_chords[:len(barred_chords)]
+        assert len(fretted_chords) + len(barred_chords) < len(all_fretted_chords) + len(all_barred_chords)
+
+
+def test_executor_matches_serial_search():
+    from concurrent.futures import ProcessPoolExecutor
+    from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+    from charting_better import iter_instrument_chord_voicings
+    from style_dicts import instrument_presets
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for preset, chord_types, chord_roots in engine_parity_cases:
+            num_frets, tuning = instrument_presets[preset]
+            semitones_from_c = get_instrument_semitones_from_c(num_frets, tuning.split("-"))
+            for chord_type in chord_types:
+                for chord_root in chord_roots:
+                    semitones_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+                    expected = list(iter_instrument_chord_voicings(semitones_from_c, semitones_in_chord))
+                    found = list(iter_instrument_chord_voicings(
+                        semitones_from_c, semitones_in_chord, executor=executor))
+                    assert found == expected, f"{preset}, {chord_root}{chord_type}"
+
+
 if __name__ == '__main__':
     graphics_test()
\ No newline at end of file
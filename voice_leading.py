@@ -0,0 +1,167 @@
+from voicing_encoding import MUTED_FRET
+from voicing_scoring import score_voicing
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; plan_progression_voicings works in plain python without it
+    np = None
+
+
+# cost per unit of each voice leading feature between consecutive voicings, and of each voicing's own playability
+voice_leading_weights = {'hand_movement': 1.0,  # frets the hand moves, by lowest fretted note
+                         'voice_motion': 0.5,  # semitones moved by notes on strings played in both voicings
+                         'voice_changes': 1.0,  # strings starting or stopping between the voicings
+                         'playability': 0.5,  # see voicing_scoring.score_voicing
+                         }
+
+
+def get_string_frets(
+        string_fret_tuples: list[tuple[int, int]],
+        num_strings: int,
+) -> list[int]:
+    """
+    Gets the fret played on each string of a voicing, MUTED_FRET for unplayed strings
+    """
+    string_frets: list[int] = [MUTED_FRET] * num_strings
+    for string, fret in string_fret_tuples:
+        string_frets[string] = fret
+
+    return string_frets
+
+
+def get_hand_position(string_fret_tuples: list[tuple[int, int]]) -> int:
+    """
+    Gets the lowest fretted note of a voicing, or 0 if only open strings are played
+    """
+    return min((fret for _, fret in string_fret_tuples if fret != 0), default=0)
+
+
+def get_transition_costs(
+        previous_voicings: list[tuple[list[tuple[int, int]], bool]],
+        voicings: list[tuple[list[tuple[int, int]], bool]],
+        num_strings: int,
+        weights: dict[str, float] = voice_leading_weights,
+) -> list[list[float]]:
+    """
+    Gets the voice leading cost of moving from each of one chord's voicings to each of the next's. Notes on a string
+        move by the difference in fret, so voice motion needs no pitch octaves.
+    :param previous_voicings: (string_fret_tuples, is_barre) voicings of the first chord
+    :param voicings: (string_fret_tuples, is_barre) voicings of the second chord
+    :param num_strings: Number of strings on the instrument
+    :param weights: Cost of each voice leading feature; see voice_leading_weights
+    :return: cost of each (previous voicing, voicing) pair, indexed by previous voicing first
+    """
+    string_frets = [get_string_frets(voicing[0], num_strings) for voicing in voicings]
+    hand_positions = [get_hand_position(voicing[0]) for voicing in voicings]
+
+    transition_costs: list[list[float]] = list()
+    for previous_voicing in previous_voicings:
+        previous_frets = get_string_frets(previous_voicing[0], num_strings)
+        previous_hand_position = get_hand_position(previous_voicing[0])
+        previous_transition_costs: list[float] = list()
+        for frets, hand_position in zip(string_frets, hand_positions):
+            voice_motion, voice_changes = 0, 0
+            for previous_fret, fret in zip(previous_frets, frets):
+                if previous_fret == MUTED_FRET or fret == MUTED_FRET:
+                    voice_changes += previous_fret != fret
+                else:
+                    voice_motion += abs(previous_fret - fret)
+            previous_transition_costs.append(
+                weights.get('hand_movement') * abs(previous_hand_position - hand_position)
+                + weights.get('voice_motion') * voice_motion
+                + weights.get('voice_changes') * voice_changes)
+        transition_costs.append(previous_transition_costs)
+
+    return transition_costs
+
+
+def get_transition_cost_array(
+        previous_voicings: list[tuple[list[tuple[int, int]], bool]],
+        voicings: list[tuple[list[tuple[int, int]], bool]],
+        num_strings: int,
+        weights: dict[str, float] = voice_leading_weights,
+):
+    """
+    NumPy version of get_transition_costs, computing every pair at once
+    :return: (previous voicings x voicings) cost array
+    """
+    if np is None:
+        raise ImportError("get_transition_cost_array requires numpy; use get_transition_costs instead")
+
+    previous_string_frets = np.array(
+        [get_string_frets(voicing[0], num_strings) for voicing in previous_voicings]).reshape(-1, 1, num_strings)
+    string_frets = np.array(
+        [get_string_frets(voicing[0], num_strings) for voicing in voicings]).reshape(1, -1, num_strings)
+    previous_hand_positions = np.array([get_hand_position(voicing[0]) for voicing in previous_voicings])
+    hand_positions = np.array([get_hand_position(voicing[0]) for voicing in voicings])
+    previous_is_played = previous_string_frets != MUTED_FRET
+    is_played = string_frets != MUTED_FRET
+
+    hand_movement = np.abs(previous_hand_positions[:, None] - hand_positions[None, :])
+    voice_motion = np.where(
+        previous_is_played & is_played, np.abs(previous_string_frets - string_frets), 0).sum(axis=2)
+    voice_changes = np.count_nonzero(previous_is_played != is_played, axis=2)
+
+    return (weights.get('hand_movement') * hand_movement
+            + weights.get('voice_motion') * voice_motion
+            + weights.get('voice_changes') * voice_changes)
+
+
+def plan_progression_voicings(
+        progression_voicings: list[list[tuple[list[tuple[int, int]], bool]]],
+        num_strings: int,
+        weights: dict[str, float] = voice_leading_weights,
+) -> list[int]:
+    """
+    Picks one voicing per chord of a progression to minimise the playability cost of the voicings plus the voice
+        leading cost between consecutive ones over the whole progression, by dynamic programming (Viterbi) over the
+        chords. Uses numpy for the transition costs if it is installed.
+    :param progression_voicings: Candidate (string_fret_tuples, is_barre) voicings of each chord, in progression order
+    :param num_strings: Number of strings on the instrument
+    :param weights: Cost of each voice leading feature; see voice_leading_weights
+    :return: index of the chosen voicing of each chord; empty if any chord has no voicings
+    """
+    if not progression_voicings or not all(progression_voicings):
+        return list()
+
+    # lowest total cost of a path ending at each voicing of the current chord
+    path_costs: list[float] = [
+        weights.get('playability') * score_voicing(*voicing) for voicing in progression_voicings[0]]
+    # for each chord after the first, the voicing of the chord before it on the lowest cost path to each of its voicings
+    backpointers: list[list[int]] = list()
+
+    for previous_voicings, voicings in zip(progression_voicings[:-1], progression_voicings[1:]):
+        voicing_costs: list[float] = [weights.get('playability') * score_voicing(*voicing) for voicing in voicings]
+
+        if np is not None:
+            path_cost_array = np.array(path_costs)[:, None] + get_transition_cost_array(
+                previous_voicings, voicings, num_strings, weights)
+            # argmin takes the first minimum, so ties go to the earliest previous voicing
+            chord_backpointers: list[int] = path_cost_array.argmin(axis=0).tolist()
+            best_path_costs: list[float] = path_cost_array.min(axis=0).tolist()
+        else:
+            chord_backpointers = [0] * len(voicings)
+            best_path_costs = [float("inf")] * len(voicings)
+            for previous_idx, previous_transition_costs in enumerate(
+                    get_transition_costs(previous_voicings, voicings, num_strings, weights)):
+                previous_path_cost = path_costs[previous_idx]
+                for voicing_idx, transition_cost in enumerate(previous_transition_costs):
+                    if previous_path_cost + transition_cost < best_path_costs[voicing_idx]:
+                        best_path_costs[voicing_idx] = previous_path_cost + transition_cost
+                        chord_backpointers[voicing_idx] = previous_idx
+
+        path_costs = [
+            best_path_cost + voicing_cost for best_path_cost, voicing_cost in zip(best_path_costs, voicing_costs)]
+        backpointers.append(chord_backpointers)
+
+    voicing_idx = min(range(len(path_costs)), key=path_costs.__getitem__)
+    voicing_idxs: list[int] = [voicing_idx]
+    for chord_backpointers in reversed(backpointers):
+        voicing_idx = chord_backpointers[voicing_idx]
+        voicing_idxs.append(voicing_idx)
+
+    return voicing_idxs[::-1]
+
+
+if __name__ == '__main__':
+    pass
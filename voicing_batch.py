@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+from charting_better import iter_instrument_chord_voicings
+from chord_dicts import chords_to_intervals, note_to_index, index_to_note
+from style_dicts import instrument_presets
+from voicing_database import (DEFAULT_DATABASE_DIR, VoicingDatabase, encode_voicings, get_voicing_database_path,
+                              open_voicing_database)
+
+
+def get_job_instruments(job_spec: dict) -> list[tuple[int, str]]:
+    """
+    Gets the (num_frets, tuning) of every instrument in a job spec, without repeats
+    :param job_spec: Job spec; see run_voicing_batch
+    """
+    instruments: list[tuple[int, str]] = [instrument_presets[preset] for preset in job_spec.get("presets", list())]
+    for tuning in job_spec.get("tunings", list()):
+        for num_frets in job_spec.get("fret_counts", [22]):
+            instruments.append((num_frets, tuning))
+
+    return list(dict.fromkeys(instruments))
+
+
+def get_job_roots(job_spec: dict) -> list[str]:
+    """
+    Gets the roots of a job spec, one per pitch class, since enharmonic roots share their voicings and database slot
+    """
+    roots = job_spec.get("roots", list(note_to_index.keys()))
+
+    return [index_to_note.get(root_idx) for root_idx in dict.fromkeys(note_to_index[root] for root in roots)]
+
+
+def get_checkpoint_path(database_path: str) -> str:
+    return database_path + ".done"
+
+
+def read_checkpoint(checkpoint_path: str) -> set[tuple[str, str]]:
+    """
+    Gets the (root, chord type) pairs already stored by earlier runs. A line left unfinished by an interrupted run is
+        dropped from the file, so its chord is simply computed again.
+    """
+    finished_chords: set[tuple[str, str]] = set()
+    if not os.path.exists(checkpoint_path):
+        return finished_chords
+
+    with open(checkpoint_path) as checkpoint_file:
+        for line in checkpoint_file:
+            try:
+                chord_root, chord_type = json.loads(line)
+            except ValueError:
+                continue
+            finished_chords.add((chord_root, chord_type))
+
+    # rewrite the checkpoint so that new lines are not appended to an unfinished one
+    with open(checkpoint_path, "w") as checkpoint_file:
+        for chord_root, chord_type in finished_chords:
+            checkpoint_file.write(json.dumps([chord_root, chord_type]) + "\n")
+
+    return finished_chords
+
+
+def find_shard_voicings(
+        num_frets: int,
+        tuning: str,
+        chord_root: str,
+        chord_types: list[str],
+) -> tuple[int, str, str, list[tuple[str, bytes]]]:
+    """
+    Process pool task for run_voicing_batch: every voicing of one root's chord types on one instrument.
+    :return: num_frets, tuning, chord_root and each chord type with its voicings encoded by encode_voicings
+    """
+    semitones_from_c: list[list[int]] = get_instrument_semitones_from_c(num_frets, tuning.split("-"))
+    records: list[tuple[str, bytes]] = list()
+    for chord_type in chord_types:
+        intervals_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+        voicings = list(iter_instrument_chord_voicings(semitones_from_c, intervals_in_chord))
+        records.append((chord_type, encode_voicings(voicings)))
+
+    return num_frets, tuning, chord_root, records
+
+
+def run_voicing_batch(
+        job_spec: dict,
+        num_workers: int = 1,
+        database_dir: str = DEFAULT_DATABASE_DIR,
+) -> None:
+    """
+    Computes and stores every chord of a job spec in the voicing databases of its instruments. Work is sharded by
+        instrument and root and run on a process pool; each finished chord is recorded in a checkpoint file next to its
+        database, so an interrupted run picks up where it stopped when started again with the same job spec.
+    :param job_spec: Dict with any of
+        "presets": names from style_dicts.instrument_presets,
+        "tunings": hyphen-separated tunings, each built with every fret count in "fret_counts" (default [22]),
+        "chord_types": chord types from chord_dicts.chords_to_intervals (default all),
+        "roots": root notes (default all)
+    :param num_workers: Number of worker processes. Default 1.
+    :param database_dir: Directory of the voicing databases
+    """
+    chord_types: list[str] = job_spec.get("chord_types", list(chords_to_intervals.keys()))
+    unknown_chord_types = [chord_type for chord_type in chord_types if chord_type not in chords_to_intervals]
+    assert not unknown_chord_types, f"Unknown chord types {unknown_chord_types}"
+    chord_roots = get_job_roots(job_spec)
+
+    databases: dict[tuple[int, str], VoicingDatabase] = dict()
+    shards: list[tuple[int, str, str, list[str]]] = list()
+    for num_frets, tuning in get_job_instruments(job_spec):
+        database_path = get_voicing_database_path(num_frets, tuning, database_dir)
+        database = open_voicing_database(num_frets, tuning, database_dir)
+        if database is None:
+            # a new database makes any checkpoint left from an older one meaningless
+            if os.path.exists(get_checkpoint_path(database_path)):
+                os.remove(get_checkpoint_path(database_path))
+            database = VoicingDatabase.create(database_path)
+        databases.update({(num_frets, tuning): database})
+
+        finished_instrument_chords = read_checkpoint(get_checkpoint_path(database_path))
+        for chord_root in chord_roots:
+            remaining_chord_types = [
+                chord_type for chord_type in chord_types if (chord_root, chord_type) not in finished_instrument_chords]
+            if remaining_chord_types:
+                shards.append((num_frets, tuning, chord_root, remaining_chord_types))
+
+    print(f"{len(shards)} shards to run on {num_workers} workers")
+
+    # only this process writes to the databases and checkpoints; workers just return their records
+    num_failed_shards = 0
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(find_shard_voicings, *shard): shard for shard in shards}
+        for shard_idx, future in enumerate(as_completed(futures)):
+            num_frets, tuning, chord_root, _ = futures[future]
+            progress = f"[{shard_idx + 1}/{len(shards)}] {tuning} ({num_frets} frets), {chord_root}"
+            # a failed shard is left out of the checkpoint, to be run again next time; the others are still stored
+            try:
+                _, _, _, records = future.result()
+            except Exception as e:
+                num_failed_shards += 1
+                print(f"{progress} failed: {e!r}")
+                continue
+
+            database = databases.get((num_frets, tuning))
+            with open(get_checkpoint_path(database.path), "a") as checkpoint_file:
+                for chord_type, record in records:
+                    if database.store_record(chord_root, chord_type, record):
+                        checkpoint_file.write(json.dumps([chord_root, chord_type]) + "\n")
+                    else:
+                        print(f"{progress}: {database.path} has no slot for {chord_type}, not stored")
+            print(progress)
+
+    if num_failed_shards:
+        print(f"{num_failed_shards} of {len(shards)} shards failed; run the job again to retry them")
+
+    return
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Computes chord voicings for a job spec into the voicing databases.")
+    parser.add_argument("job_spec", help="JSON job spec; see run_voicing_batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--database-dir", default=DEFAULT_DATABASE_DIR, help="directory of the voicing databases")
+    args = parser.parse_args()
+
+    with open(args.job_spec) as job_spec_file:
+        run_voicing_batch(json.load(job_spec_file), args.workers, args.database_dir)
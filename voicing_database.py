@@ -0,0 +1,221 @@
+import json
+import os
+import struct
+
+from charting import get_instrument_semitones_from_c, convert_chord_to_semitones
+from charting_better import iter_instrument_chord_voicings
+from chord_dicts import chords_to_intervals, note_to_index, index_to_note
+from style_dicts import instrument_presets
+from voicing_encoding import encode_voicing, decode_voicing, get_voicing_key_width
+
+
+# bump whenever the record encoding changes; databases written with another version are ignored and rebuilt
+DATABASE_VERSION = 3
+DATABASE_MAGIC = b"CHVD"
+DEFAULT_DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "voicing_db")
+
+# header: magic, version, length of the json chord type list which follows it
+HEADER_FORMAT = "<4sHI"
+# one index slot per (root, chord type): record offset and record length; offset 0 marks a missing record
+SLOT_FORMAT = "<QI"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+
+
+def get_voicing_database_path(
+        num_frets: int,
+        tuning: str,
+        database_dir: str = DEFAULT_DATABASE_DIR,
+) -> str:
+    return os.path.join(database_dir, f"{num_frets}_{tuning}.vdb")
+
+
+# records are a 1-byte width followed by fixed-width little-endian voicing keys, each shifted up one bit to make room
+# for the barre flag
+def encode_voicings(voicings: list[tuple[list[tuple[int, int]], bool]]) -> bytes:
+    flagged_voicing_keys: list[int] = [
+        encode_voicing(string_fret_tuples) << 1 | int(is_barre) for string_fret_tuples, is_barre in voicings]
+    width = get_voicing_key_width(flagged_voicing_keys)
+
+    return bytes([width]) + b"".join(
+        flagged_voicing_key.to_bytes(width, "little") for flagged_voicing_key in flagged_voicing_keys)
+
+
+def decode_voicings(record: bytes) -> list[tuple[list[tuple[int, int]], bool]]:
+    width = record[0]
+    flagged_voicing_keys: list[int] = [
+        int.from_bytes(record[offset:offset + width], "little") for offset in range(1, len(record), width)]
+
+    return [
+        (decode_voicing(flagged_voicing_key >> 1), bool(flagged_voicing_key & 1))
+        for flagged_voicing_key in flagged_voicing_keys]
+
+
+class VoicingDatabase:
+    """
+    On-disk voicings of every root and chord type for one instrument (fret count and tuning), stored in the order
+        charting_better.iter_instrument_chord_voicings finds them. Records are found through a fixed index with one slot
+        per (root, chord type), so a lookup is two seeks regardless of database size.
+    """
+
+    def __init__(
+            self,
+            path: str,
+    ):
+        self.path = path
+        with open(self.path, "rb") as database_file:
+            magic, self.version, chord_types_length = struct.unpack(HEADER_FORMAT, database_file.read(HEADER_SIZE))
+            assert magic == DATABASE_MAGIC, f"{self.path} is not a voicing database"
+            self.chord_types: list[str] = json.loads(database_file.read(chord_types_length))
+
+        self.chord_type_to_index: dict[str, int] = {
+            chord_type: chord_type_idx for chord_type_idx, chord_type in enumerate(self.chord_types)}
+        self.index_offset = HEADER_SIZE + chord_types_length
+
+    @classmethod
+    def create(
+            cls,
+            path: str,
+            chord_types: list[str] | None = None,
+    ):
+        """
+        Writes an empty database with an index for every root and chord type.
+        """
+        chord_types = list(chords_to_intervals.keys()) if chord_types is None else chord_types
+        encoded_chord_types = json.dumps(chord_types).encode()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as database_file:
+            database_file.write(struct.pack(HEADER_FORMAT, DATABASE_MAGIC, DATABASE_VERSION, len(encoded_chord_types)))
+            database_file.write(encoded_chord_types)
+            database_file.write(bytes(SLOT_SIZE * 12 * len(chord_types)))
+
+        return cls(path)
+
+    def get_slot_offset(
+            self,
+            chord_root: str,
+            chord_type: str,
+    ) -> int | None:
+        chord_type_idx = self.chord_type_to_index.get(chord_type)
+        if chord_type_idx is None:
+            return None
+        root_idx = note_to_index.get(chord_root)
+
+        return self.index_offset + SLOT_SIZE * (root_idx * len(self.chord_types) + chord_type_idx)
+
+    def lookup(
+            self,
+            chord_root: str,
+            chord_type: str,
+    ) -> list[tuple[list[tuple[int, int]], bool]] | None:
+        """
+        :return: voicings as (string_fret_tuples, is_barre), or None if this chord has not been stored
+        """
+        slot_offset = self.get_slot_offset(chord_root, chord_type)
+        if slot_offset is None:
+            return None
+
+        with open(self.path, "rb") as database_file:
+            database_file.seek(slot_offset)
+            record_offset, record_length = struct.unpack(SLOT_FORMAT, database_file.read(SLOT_SIZE))
+            if record_offset == 0:
+                return None
+            database_file.seek(record_offset)
+            record = database_file.read(record_length)
+
+        return decode_voicings(record)
+
+    def store(
+            self,
+            chord_root: str,
+            chord_type: str,
+            voicings: list[tuple[list[tuple[int, int]], bool]],
+    ) -> bool:
+        """
+        Appends the voicings to the database and points this chord's index slot at them.
+        :return: whether the voicings were stored; False if the database has no slot for this chord type
+        """
+        return self.store_record(chord_root, chord_type, encode_voicings(voicings))
+
+    def store_record(
+            self,
+            chord_root: str,
+            chord_type: str,
+            record: bytes,
+    ) -> bool:
+        """
+        Same as store, for voicings already encoded with encode_voicings.
+        """
+        slot_offset = self.get_slot_offset(chord_root, chord_type)
+        if slot_offset is None:
+            return False
+
+        with open(self.path, "r+b") as database_file:
+            record_offset = database_file.seek(0, os.SEEK_END)
+            database_file.write(record)
+            database_file.seek(slot_offset)
+            database_file.write(struct.pack(SLOT_FORMAT, record_offset, len(record)))
+
+        return True
+
+
+def open_voicing_database(
+        num_frets: int,
+        tuning: str,
+        database_dir: str = DEFAULT_DATABASE_DIR,
+        create: bool = False,
+) -> VoicingDatabase | None:
+    """
+    Opens the voicing database for this instrument. If there is none, or it is unreadable or was written by another
+        version, returns None, or a new empty database (replacing the old one) if create is True.
+    """
+    path = get_voicing_database_path(num_frets, tuning, database_dir)
+    if os.path.exists(path):
+        try:
+            database = VoicingDatabase(path)
+        except (AssertionError, struct.error, ValueError):
+            database = None
+        if database is not None and database.version == DATABASE_VERSION:
+            return database
+
+    if create:
+        return VoicingDatabase.create(path)
+
+    return None
+
+
+def build_voicing_database(
+        num_frets: int,
+        tuning: str,
+        database_dir: str = DEFAULT_DATABASE_DIR,
+) -> VoicingDatabase:
+    """
+    Computes every root and chord type for the instrument and writes them to a new database.
+    """
+    database = VoicingDatabase.create(get_voicing_database_path(num_frets, tuning, database_dir))
+    semitones_from_c: list[list[int]] = get_instrument_semitones_from_c(num_frets, tuning.split("-"))
+
+    # enharmonic roots share a slot, so each of the 12 roots is computed once
+    for root_idx in range(12):
+        chord_root = index_to_note.get(root_idx)
+        for chord_type in database.chord_types:
+            intervals_in_chord = convert_chord_to_semitones(chord_type, chord_root)
+            voicings = list(iter_instrument_chord_voicings(semitones_from_c, intervals_in_chord))
+            database.store(chord_root, chord_type, voicings)
+
+    return database
+
+
+def build_preset_voicing_databases(
+        database_dir: str = DEFAULT_DATABASE_DIR,
+) -> None:
+    for preset, (num_frets, tuning) in instrument_presets.items():
+        print(f"Building voicings for {preset} ({num_frets} frets, {tuning})")
+        build_voicing_database(num_frets, tuning, database_dir)
+
+    return
+
+
+if __name__ == '__main__':
+    build_preset_voicing_databases()
@@ -0,0 +1,69 @@
+# a voicing packs into a single int with FRET_BITS bits per string, string 0 in the lowest bits. Each field holds the
+# fret + 1, so that MUTED_FIELD (0) marks a string left out of the voicing and unplayed high strings cost nothing.
+# Equal voicings give equal ints regardless of the order their string-fret tuples were listed in, so deduplication,
+# equality, sorting and set membership are all integer operations.
+FRET_BITS = 6
+FRET_FIELD_MASK = (1 << FRET_BITS) - 1
+MUTED_FIELD = 0
+MAX_FRET = FRET_FIELD_MASK - 1
+# fret value marking a string left out of the voicing, in voicings listed as one fret per string
+MUTED_FRET = -1
+
+
+def encode_voicing(string_fret_tuples: list[tuple[int, int]]) -> int:
+    """
+    Packs (string, fret) tuples into a voicing key
+    :param string_fret_tuples: Played strings and their frets, in any order
+    :return: voicing key
+    """
+    voicing_key = 0
+    for string, fret in string_fret_tuples:
+        voicing_key |= (fret + 1) << (FRET_BITS * string)
+
+    return voicing_key
+
+
+def decode_voicing(voicing_key: int) -> list[tuple[int, int]]:
+    """
+    Unpacks a voicing key into (string, fret) tuples
+    :param voicing_key: voicing key from encode_voicing
+    :return: played strings and their frets, ordered by string
+    """
+    string_fret_tuples: list[tuple[int, int]] = list()
+    string = 0
+    while voicing_key:
+        fret_field = voicing_key & FRET_FIELD_MASK
+        if fret_field != MUTED_FIELD:
+            string_fret_tuples.append((string, fret_field - 1))
+        voicing_key >>= FRET_BITS
+        string += 1
+
+    return string_fret_tuples
+
+
+def get_voicing_sort_key(voicing_key: int) -> tuple[int, ...]:
+    """
+    Gets the key of a voicing in canonical order: by lowest played string, then string by string from the lowest up by
+        fret, with a muted string before an open one. For the voicings of one starting string this means up the neck by
+        root fret first.
+    """
+    fret_fields: list[int] = list()
+    while voicing_key:
+        fret_fields.append(voicing_key & FRET_FIELD_MASK)
+        voicing_key >>= FRET_BITS
+    num_muted_low_strings = 0
+    while num_muted_low_strings < len(fret_fields) and fret_fields[num_muted_low_strings] == MUTED_FIELD:
+        num_muted_low_strings += 1
+
+    return num_muted_low_strings, *fret_fields[num_muted_low_strings:]
+
+
+def get_voicing_key_width(voicing_keys: list[int]) -> int:
+    """
+    Gets the number of bytes needed to store the largest voicing key
+    """
+    return max((max(voicing_keys, default=0).bit_length() + 7) // 8, 1)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,74 @@
+from heapq import heappush, heappushpop
+from typing import Iterable
+
+
+# cost per unit of each playability feature; negative weights make a feature desirable
+playability_weights = {'fret_span': 1.0,  # frets between the lowest and highest fretted notes
+                       'fretted_notes': 1.0,  # fingers needed, counting a barre as one
+                       'barre_strings': 0.25,  # strings held down by the barre
+                       'open_strings': -0.5,
+                       'skipped_strings': 1.0,  # unplayed strings between played ones, which have to be muted
+                       'neck_position': 0.1,  # lowest fretted note; shapes far up the neck are harder to find
+                       }
+
+
+def score_voicing(
+        string_fret_tuples: list[tuple[int, int]],
+        is_barre: bool,
+        weights: dict[str, float] = playability_weights,
+) -> float:
+    """
+    Scores how hard a voicing is to play
+    :param string_fret_tuples: Played strings and their frets
+    :param is_barre: Whether the voicing is played with a barre on its lowest fret
+    :param weights: Cost of each playability feature; see playability_weights
+    :return: playability cost; lower is easier
+    """
+    fretted_frets: list[int] = [fret for _, fret in string_fret_tuples if fret != 0]
+    num_open_strings = len(string_fret_tuples) - len(fretted_frets)
+    played_strings: list[int] = [string for string, _ in string_fret_tuples]
+    num_skipped_strings = max(played_strings) - min(played_strings) + 1 - len(played_strings)
+    lowest_fret = min(fretted_frets, default=0)
+    fret_span = max(fretted_frets, default=0) - lowest_fret
+
+    num_barre_strings = fretted_frets.count(lowest_fret) if is_barre else 0
+    # the barre takes one finger for all of its strings
+    num_fingers = len(fretted_frets) - num_barre_strings + int(is_barre)
+
+    return (weights.get('fret_span') * fret_span
+            + weights.get('fretted_notes') * num_fingers
+            + weights.get('barre_strings') * num_barre_strings
+            + weights.get('open_strings') * num_open_strings
+            + weights.get('skipped_strings') * num_skipped_strings
+            + weights.get('neck_position') * lowest_fret)
+
+
+def select_top_voicings(
+        voicings: Iterable[tuple[list[tuple[int, int]], bool]],
+        top_k: int,
+        weights: dict[str, float] = playability_weights,
+) -> list[tuple[list[tuple[int, int]], bool]]:
+    """
+    Keeps the top_k most playable voicings of a stream, holding no more than top_k of them at once
+    :param voicings: (string_fret_tuples, is_barre) voicings, e.g. from Instrument.iter_chord_fret_pairs
+    :param top_k: Number of voicings to keep
+    :param weights: Cost of each playability feature; see playability_weights
+    :return: up to top_k voicings, easiest first; equal scores keep their order in the stream
+    """
+    if top_k <= 0:
+        return list()
+
+    # heap root is the worst voicing kept: highest score, then latest in the stream
+    heap: list[tuple[float, int, tuple[list[tuple[int, int]], bool]]] = list()
+    for voicing_idx, voicing in enumerate(voicings):
+        heap_entry = (-score_voicing(*voicing, weights=weights), -voicing_idx, voicing)
+        if len(heap) < top_k:
+            heappush(heap, heap_entry)
+        elif heap_entry > heap[0]:
+            heappushpop(heap, heap_entry)
+
+    return [voicing for _, _, voicing in sorted(heap, reverse=True)]
+
+
+if __name__ == '__main__':
+    pass